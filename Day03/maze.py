@@ -0,0 +1,280 @@
+import os
+import random
+import time
+from collections import deque
+from collections.abc import MutableMapping
+from operator import attrgetter
+
+import maze_checkpoint
+from maze_checkpoint import CHECKPOINT_EVERY
+
+# Pygame-free maze core: generation (recursive backtracker) and the step-by-step
+# solver. day3_full.py draws and animates these; batch jobs can import this
+# module directly without pygame. Long runs can checkpoint (maze_checkpoint.py).
+
+# Constants
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+DIR_NAMES = ['up', 'right', 'down', 'left']
+WALL_NAMES = ['north', 'east', 'south', 'west'] # Wall crossed by each direction; k ^ 2 is the opposite
+WALLS = dict(zip(DIRECTIONS, WALL_NAMES))
+# Bits of Maze.open, one per open side, in DIRECTIONS order (SIDES[k] == 1 << k)
+NORTH, EAST, SOUTH, WEST = 1, 2, 4, 8
+SIDES = [NORTH, EAST, SOUTH, WEST]
+WALL_BITS = dict(zip(WALL_NAMES, SIDES))
+ALL_SIDES = NORTH | EAST | SOUTH | WEST
+
+def inside_sides(width, height):
+    """
+    Sides of every cell (index x * height + y, one byte each) that lead to
+    another cell of the grid. Masking with it replaces the bounds checks.
+    """
+    column = bytearray([ALL_SIDES]) * height
+    column[0] ^= NORTH
+    column[-1] ^= SOUTH
+    if width == 1:
+        return bytes(sides ^ EAST ^ WEST for sides in column)
+    first = bytes(sides ^ WEST for sides in column)
+    last = bytes(sides ^ EAST for sides in column)
+    return first + bytes(column) * (width - 2) + last
+
+class CellWalls(MutableMapping):
+    """
+    One cell's walls as a dict ({'north': True, ...}, True = closed) backed by
+    its byte of Maze.open, so the walls are stored once and the solvers always
+    see edits made through cell.walls.
+    """
+    __slots__ = ('open', 'index')
+
+    def __init__(self, open_sides, index):
+        self.open, self.index = open_sides, index
+
+    def __getitem__(self, name):
+        return not self.open[self.index] & WALL_BITS[name]
+
+    def __setitem__(self, name, closed):
+        if closed:
+            self.open[self.index] &= ~WALL_BITS[name] & 0xF
+        else:
+            self.open[self.index] |= WALL_BITS[name]
+
+    def __delitem__(self, name):
+        raise TypeError("a cell always has all four walls")
+
+    def __iter__(self):
+        return iter(('north', 'south', 'east', 'west'))
+
+    def __len__(self):
+        return 4
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class Cell:
+    def __init__(self, x, y, walls):
+        self.x, self.y, self.visited = x, y, False
+        self.walls = walls # CellWalls view of the maze's open sides
+        self.step_number = None
+        self.is_solution = False
+
+class Maze:
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        # Open sides of every cell (NORTH/EAST/SOUTH/WEST bits), index x * height + y.
+        # The only copy of the walls: cell.walls is a view of it, so it is updated
+        # in place and never replaced
+        self.open = bytearray(width * height)
+        self.cells = [[Cell(x, y, CellWalls(self.open, x * height + y)) for y in range(height)]
+                      for x in range(width)]
+        self.cell_list = [cell for column in self.cells for cell in column] # Index x * height + y
+        self.offsets = (-1, height, 1, -height) # Index offset of the neighbor in each of DIRECTIONS
+        # Sides with a neighbor inside the grid. Every search masks Maze.open with
+        # it, so an outer wall opened through cell.walls never leads off the grid
+        self.inside = inside_sides(width, height)
+
+    def get_wall(self, dx, dy):
+        return WALLS[(dx, dy)]
+
+    def generate(self, rng=random, checkpoint=None, checkpoint_every=CHECKPOINT_EVERY):
+        # rng: anything with .choice(); defaults to the global random module
+        # checkpoint: optional file path. The run's state is saved there every
+        # checkpoint_every seconds and the file is deleted when done. An existing
+        # checkpoint is resumed if it was started from the same RNG state (rng
+        # then needs getstate()/setstate(), like random.Random); else ValueError.
+        if checkpoint is not None:
+            checksum = maze_checkpoint.rng_checksum(rng)
+        cells, opened, inside, height = self.cell_list, self.open, self.inside, self.height
+        if checkpoint is not None and os.path.exists(checkpoint):
+            i, stack, visited = maze_checkpoint.load_generate(checkpoint, self, checksum, rng)
+        else:
+            # Cells are tracked by index; cell.visited is written back when done
+            visited = bytearray(map(attrgetter('visited'), cells))
+            stack, i = [], 0
+            visited[i] = 1
+        next_save = time.perf_counter() + checkpoint_every
+        while True:
+            if checkpoint is not None and time.perf_counter() >= next_save:
+                started = time.perf_counter()
+                maze_checkpoint.save_generate(checkpoint, self, checksum, rng, i, stack, visited)
+                next_save = maze_checkpoint.next_save_time(started, checkpoint_every)
+            # Unvisited neighbors in DIRECTIONS order, as (direction index, cell index)
+            sides = inside[i]
+            neighbors = []
+            if sides & NORTH and not visited[i - 1]:
+                neighbors.append((0, i - 1))
+            if sides & EAST and not visited[i + height]:
+                neighbors.append((1, i + height))
+            if sides & SOUTH and not visited[i + 1]:
+                neighbors.append((2, i + 1))
+            if sides & WEST and not visited[i - height]:
+                neighbors.append((3, i - height))
+            if neighbors:
+                k, j = rng.choice(neighbors)
+                opened[i] |= SIDES[k] # Opens current's wall and the next cell's facing one
+                opened[j] |= SIDES[k ^ 2]
+                visited[j] = 1
+                stack.append(i)
+                i = j
+            elif stack:
+                i = stack.pop()
+            else:
+                break
+        for cell, flag in zip(cells, visited):
+            cell.visited = flag == 1
+        if checkpoint is not None and os.path.exists(checkpoint): # Finished: nothing to resume
+            os.remove(checkpoint)
+
+    def get_neighbor_states(self, cell):
+        states = {}
+        cells = self.cell_list
+        i = cell.x * self.height + cell.y
+        sides, inside = self.open[i], self.inside[i]
+        for k, offset in enumerate(self.offsets):
+            direction_name = DIR_NAMES[k]
+            if inside & SIDES[k]:
+                neighbor = cells[i + offset]
+                wall_between = not sides & SIDES[k]
+                if neighbor is cells[-1] and not wall_between:
+                    states[direction_name] = "goal"
+                elif neighbor.step_number is not None:
+                    states[direction_name] = "visited"
+                elif not wall_between:
+                    states[direction_name] = "open"
+                else:
+                    states[direction_name] = "wall"
+            else:
+                states[direction_name] = "invalid"
+        return states
+
+    def move(self, neighbors, current):
+        for direction, state in neighbors.items():
+            if state in ("open", "goal"):
+                idx = DIR_NAMES.index(direction)
+                dx, dy = DIRECTIONS[idx]
+                return self.cells[current.x + dx][current.y + dy]
+
+        return None
+
+    def solve(self, on_step=None, checkpoint=None, checkpoint_every=CHECKPOINT_EVERY, fast=False):
+        # Depth-first search from the top-left to the bottom-right cell, numbering
+        # cells in visiting order, then marks the shortest path back.
+        # on_step(moved) is called after every step, e.g. to draw the search.
+        # checkpoint / checkpoint_every: save and resume the search, as in generate();
+        # a checkpoint saved on a maze with other walls is rejected (ValueError).
+        # fast: pick each step straight from Maze.open instead of through the
+        # get_neighbor_states() and move() hooks; same search, 2-3x quicker.
+        # Returns the solution path from the end back to the start.
+        cells, opened, inside, offsets, height = self.cell_list, self.open, self.inside, self.offsets, self.height
+        end = cells[-1]
+        if checkpoint is not None:
+            checksum = maze_checkpoint.walls_checksum(self)
+        if checkpoint is not None and os.path.exists(checkpoint):
+            step, stack = maze_checkpoint.load_solve(checkpoint, self, checksum)
+            current = stack[-1]
+        else:
+            current = self.cells[0][0]
+            stack, step = [current], 1
+            current.step_number = step
+        next_save = time.perf_counter() + checkpoint_every
+
+        while current != end:
+            if checkpoint is not None and time.perf_counter() >= next_save:
+                started = time.perf_counter()
+                maze_checkpoint.save_solve(checkpoint, self, checksum, step, stack)
+                next_save = maze_checkpoint.next_save_time(started, checkpoint_every)
+            if fast:
+                # What move(get_neighbor_states()) picks: the first open, unvisited neighbor
+                # in DIRECTIONS order (the goal is unvisited until we stop on it)
+                i, next_cell = current.x * height + current.y, None
+                sides = opened[i] & inside[i]
+                for k, offset in enumerate(offsets):
+                    if sides & SIDES[k] and cells[i + offset].step_number is None:
+                        next_cell = cells[i + offset]
+                        break
+            else:
+                neighbors = self.get_neighbor_states(current)
+                next_cell = self.move(neighbors, current)
+            moved = next_cell is not None
+            if moved:
+                step += 1
+                next_cell.step_number = step
+                stack.append(next_cell)
+                current = next_cell
+            else:
+                stack.pop()
+                current = stack[-1]
+
+            if on_step is not None:
+                on_step(moved)
+        if checkpoint is not None and os.path.exists(checkpoint): # Finished: nothing to resume
+            os.remove(checkpoint)
+
+        # Backtrack to find the shortest path
+        current = end
+        path = [current]
+        while current.step_number != 1:
+            i = current.x * height + current.y
+            sides = opened[i] & inside[i]
+            neighbors = [cells[i + offset] for k, offset in enumerate(offsets)
+                         if sides & SIDES[k] and cells[i + offset].step_number is not None
+                         and cells[i + offset].step_number < current.step_number]
+
+            if not neighbors:
+                raise Exception(f"No valid neighbor found from cell ({current.x}, {current.y}) during backtracking!")
+
+            current = min(neighbors, key=lambda cell: cell.step_number)
+            path.append(current)
+
+        # Mark the shortest path
+        for cell in path:
+            cell.is_solution = True
+        return path
+
+    def solve_bfs(self, on_step=None):
+        # Breadth-first search from the top-left to the bottom-right cell. Numbers
+        # cells in the order they are dequeued and marks the path it finds, which
+        # is the shortest one. Returns it from the end back to the start, like solve().
+        cells, opened, inside, offsets = self.cell_list, self.open, self.inside, self.offsets
+        end = len(cells) - 1
+        parents = {0: None} # Cell index -> index it was reached from
+        queue, step = deque([0]), 0
+
+        while queue:
+            i = queue.popleft()
+            step += 1
+            cells[i].step_number = step
+            if on_step is not None:
+                on_step(True)
+            if i == end:
+                break
+            sides = opened[i] & inside[i]
+            for k, offset in enumerate(offsets):
+                if sides & SIDES[k] and i + offset not in parents:
+                    parents[i + offset] = i
+                    queue.append(i + offset)
+
+        path, i = [], end
+        while i is not None:
+            cells[i].is_solution = True
+            path.append(cells[i])
+            i = parents[i]
+        return path
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+from maze import Maze
+
+# Times maze generation and the solvers on fixed seeds, appends passing runs to a
+# JSON history file and fails when a workload got slower than its baseline, the
+# median of the last BASELINE_RUNS saved runs, by more than the threshold. Failing
+# runs are not saved, so a regression never becomes the baseline. The solve
+# workloads re-solve each maze many times, like a service answering repeated
+# queries on the same mazes.
+#
+#   python maze_benchmark.py                          # all workloads, save if passing, check
+#   python maze_benchmark.py --workloads solve_dfs --repeat 5
+#   python maze_benchmark.py --no-save                # just print
+
+# --- Settings ---
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'maze_bench_history.json')
+THRESHOLD = 0.15 # Fail if a workload's time grows by more than 15%
+REPEAT = 3 # Timed runs per workload; the fastest one counts
+BASELINE_RUNS = 5 # Saved runs whose median time is the baseline
+SIZES = [(10, 10), (50, 50), (150, 150)]
+SEEDS = range(5) # Mazes per size
+SOLVES = 10 # Times each maze is solved per run
+WORKLOADS_VERSION = 2 # Bump when a workload starts timing different work (2: generate includes Maze())
+
+# --- Workloads ---
+# Each workload takes the mazes (already generated) and returns how many
+# operations it timed; only the operations themselves (including building a
+# new Maze for generate) are inside the timer.
+
+def clear_search(maze):
+    for column in maze.cells:
+        for cell in column:
+            cell.step_number = None
+            cell.is_solution = False
+
+def build_mazes():
+    mazes = []
+    for width, height in SIZES:
+        for seed in SEEDS:
+            maze = Maze(width, height)
+            maze.generate(random.Random(seed))
+            mazes.append(maze)
+    return mazes
+
+def workload_generate(mazes):
+    elapsed = 0.0
+    for maze in mazes:
+        # Building the Maze is timed too: every new maze pays for it
+        start = time.perf_counter()
+        fresh = Maze(maze.width, maze.height)
+        fresh.generate(random.Random(maze.width * 1000 + maze.height))
+        elapsed += time.perf_counter() - start
+    return elapsed, len(mazes)
+
+def timed_solves(mazes, solve):
+    elapsed = 0.0
+    for maze in mazes:
+        for _ in range(SOLVES):
+            clear_search(maze)
+            start = time.perf_counter()
+            solve(maze)
+            elapsed += time.perf_counter() - start
+    return elapsed, len(mazes) * SOLVES
+
+def workload_solve_dfs(mazes):
+    return timed_solves(mazes, lambda maze: maze.solve(fast=True))
+
+def workload_solve_dfs_hooks(mazes):
+    return timed_solves(mazes, Maze.solve) # Through get_neighbor_states() and move()
+
+def workload_solve_bfs(mazes):
+    return timed_solves(mazes, Maze.solve_bfs)
+
+def workload_neighbor_states(mazes):
+    clear_search(mazes[-1])
+    cells = [cell for column in mazes[-1].cells for cell in column]
+    start = time.perf_counter()
+    for cell in cells:
+        mazes[-1].get_neighbor_states(cell)
+    return time.perf_counter() - start, len(cells)
+
+WORKLOADS = {
+    'generate': workload_generate,
+    'solve_dfs': workload_solve_dfs,
+    'solve_dfs_hooks': workload_solve_dfs_hooks,
+    'solve_bfs': workload_solve_bfs,
+    'neighbor_states': workload_neighbor_states,
+}
+
+def measure(workload, mazes, repeat):
+    """Runs workload `repeat` times and keeps the fastest run."""
+    best = None
+    for _ in range(repeat):
+        elapsed, operations = workload(mazes)
+        if best is None or elapsed < best[0]:
+            best = (elapsed, operations)
+    elapsed, operations = best
+    return {'time': elapsed, 'operations': operations,
+            'microseconds_per_op': elapsed / operations * 1e6 if operations else 0.0}
+
+# --- History ---
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+def save_history(path, history):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path) # Never leave a half-written history behind
+
+def find_regressions(history, run, threshold, baseline_runs=BASELINE_RUNS):
+    """
+    Compares each workload in run with its baseline: the median time of its last
+    baseline_runs results in history (same config). The median keeps one noisy
+    run from moving the baseline. Returns [(workload, baseline, new time)] for
+    the workloads that got slower than that by more than threshold.
+    """
+    regressions = []
+    for name, result in run['workloads'].items():
+        times = [previous['workloads'][name]['time'] for previous in history
+                 if previous.get('config') == run['config'] and name in previous['workloads']]
+        if not times:
+            continue
+        baseline = statistics.median(times[-baseline_runs:])
+        if result['time'] > baseline * (1 + threshold):
+            regressions.append((name, baseline, result['time']))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Day03 maze generator and solvers.")
+    parser.add_argument('--workloads', nargs='+', choices=sorted(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="timed runs per workload (best counts)")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="allowed slowdown vs the baseline, e.g. 0.1 for 10%%")
+    parser.add_argument('--baseline-runs', type=int, default=BASELINE_RUNS,
+                        help="saved runs whose median is the baseline")
+    parser.add_argument('--history', default=HISTORY_FILE, help="JSON history file")
+    parser.add_argument('--no-save', action='store_true', help="don't append this run to the history")
+    parser.add_argument('--save-failing', action='store_true',
+                        help="append this run even if it regressed (e.g. to accept a deliberate slowdown)")
+    parser.add_argument('--label', default='', help="note stored with the run, e.g. a commit")
+    args = parser.parse_args(argv)
+
+    mazes = build_mazes()
+    run = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'label': args.label,
+        # Results are only compared between runs with the same config, so a shared
+        # history never measures one host or interpreter against another
+        'config': {'sizes': [list(size) for size in SIZES], 'seeds': len(SEEDS), 'solves': SOLVES,
+                   'workloads_version': WORKLOADS_VERSION,
+                   'machine': f"{platform.node()} {platform.machine()}",
+                   'python': f"{platform.python_implementation()} {platform.python_version()}"},
+        'workloads': {},
+    }
+
+    print(f"{'workload':<18}{'time (s)':>10}{'ops':>8}{'us/op':>12}")
+    for name in args.workloads:
+        result = measure(WORKLOADS[name], mazes, args.repeat)
+        run['workloads'][name] = result
+        print(f"{name:<18}{result['time']:>10.3f}{result['operations']:>8}{result['microseconds_per_op']:>12.1f}")
+
+    history = load_history(args.history)
+    regressions = find_regressions(history, run, args.threshold, args.baseline_runs)
+    if not args.no_save and (not regressions or args.save_failing):
+        history.append(run)
+        save_history(args.history, history)
+
+    for name, old, new in regressions:
+        print(f"REGRESSION: {name} took {new:.3f}s, baseline {old:.3f}s (+{(new / old - 1) * 100:.0f}%)")
+    if regressions and not args.no_save and not args.save_failing:
+        print("Run not saved (use --save-failing to keep it)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
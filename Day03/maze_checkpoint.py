@@ -0,0 +1,182 @@
+import array
+import io
+import os
+import struct
+import sys
+import time
+import zlib
+
+# Compact binary checkpoints for Maze.generate() and Maze.solve(), so a long run
+# can be resumed after a crash or interruption with bit-identical output.
+# A finished run deletes its checkpoint, so only interrupted runs leave one behind.
+#
+# File layout (little-endian, every array prefixed by its uint32 length):
+#   header    MAGIC, VERSION, kind (KIND_GENERATE / KIND_SOLVE), width, height
+#   generate  starting RNG checksum, RNG state, [current cell] + stack,
+#             visited bitmap, open sides of every cell (a copy of maze.open)
+#   solve     walls checksum, step counter, stack, step number of every cell (0 = not yet)
+# Cells are numbered x * height + y, the order of maze.cells and maze.open.
+
+# --- Settings ---
+CHECKPOINT_EVERY = 60.0 # Seconds between checkpoints
+MAX_OVERHEAD = 0.05 # Never spend more than 5% of the run writing checkpoints
+
+MAGIC = b'MZCK'
+VERSION = 3
+KIND_GENERATE, KIND_SOLVE = 0, 1
+HEADER = struct.Struct('<4sBBII')
+RNG_HEADER = struct.Struct('<B?d') # Mersenne Twister version, has gauss_next, gauss_next
+UINT = struct.Struct('<I')
+
+# --- Encoding ---
+
+FLAG_BYTES = bytes.maketrans(b'01', b'\x00\x01') # '0'/'1' characters to 0/1 bytes
+
+def pack_bits(flags):
+    """Packs a bytes-like of 0/1 flags into bytes, 8 per byte, the first flag in the lowest bit."""
+    bits = flags.hex()[1::2] # One '0'/'1' character per flag
+    return int(bits[::-1] or '0', 2).to_bytes((len(flags) + 7) // 8, 'little')
+
+def unpack_bits(data, count):
+    """Inverse of pack_bits: the first `count` flags stored in data, as 0/1 bytes."""
+    bits = bin(int.from_bytes(data, 'little'))[2:].zfill(count)[::-1]
+    return bits[:count].encode().translate(FLAG_BYTES)
+
+def write_bytes(f, data):
+    f.write(UINT.pack(len(data)))
+    f.write(data)
+
+def read_bytes(f):
+    length, = UINT.unpack(f.read(UINT.size))
+    data = f.read(length)
+    if len(data) != length:
+        raise ValueError("checkpoint is truncated")
+    return data
+
+def write_uints(f, values):
+    data = array.array('I', values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    write_bytes(f, data.tobytes())
+
+def read_uints(f):
+    data = array.array('I')
+    data.frombytes(read_bytes(f))
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data
+
+def write_rng(f, rng):
+    version, internal, gauss_next = rng.getstate()
+    f.write(RNG_HEADER.pack(version, gauss_next is not None, gauss_next or 0.0))
+    write_uints(f, internal)
+
+def read_rng(f, rng):
+    version, has_gauss, gauss_next = RNG_HEADER.unpack(f.read(RNG_HEADER.size))
+    rng.setstate((version, tuple(read_uints(f)), gauss_next if has_gauss else None))
+
+def rng_checksum(rng):
+    """CRC of rng's state, so a generate checkpoint is only resumed by the run that started it."""
+    f = io.BytesIO()
+    write_rng(f, rng)
+    return zlib.crc32(f.getvalue())
+
+def walls_checksum(maze):
+    """CRC of the wall layout, so a solve checkpoint is only resumed on the same maze."""
+    return zlib.crc32(maze.open)
+
+# --- Files ---
+
+def save(path, kind, maze, write_body):
+    """Writes header + body to path atomically: a crash mid-write keeps the previous checkpoint."""
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, kind, maze.width, maze.height))
+        write_body(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def open_checkpoint(path, kind, maze):
+    """Opens path for reading after checking it is a `kind` checkpoint for a maze of this size."""
+    f = open(path, 'rb')
+    try:
+        magic, version, file_kind, width, height = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} maze checkpoint")
+        if file_kind != kind:
+            raise ValueError(f"{path} is a {'solve' if file_kind == KIND_SOLVE else 'generate'} checkpoint")
+        if (width, height) != (maze.width, maze.height):
+            raise ValueError(f"{path} is for a {width}x{height} maze, not {maze.width}x{maze.height}")
+    except (ValueError, struct.error):
+        f.close()
+        raise
+    return f
+
+def next_save_time(started, every):
+    """When to save next, given that the last save started at `started` (perf_counter)."""
+    now = time.perf_counter()
+    # Slow saves (huge mazes) are spaced out so they stay under MAX_OVERHEAD of the run
+    return now + max(every, (now - started) / MAX_OVERHEAD)
+
+# --- Generator State ---
+
+def save_generate(path, maze, checksum, rng, current, stack, visited):
+    """
+    Saves a Maze.generate() run: RNG state, current cell, stack (cell indices),
+    visited cells (a bytearray of 0/1 flags) and walls.
+    """
+    def write_body(f):
+        f.write(UINT.pack(checksum))
+        write_rng(f, rng)
+        write_uints(f, [current] + stack)
+        write_bytes(f, pack_bits(visited))
+        write_bytes(f, maze.open)
+
+    save(path, KIND_GENERATE, maze, write_body)
+
+def load_generate(path, maze, checksum, rng):
+    """Restores a generate checkpoint into maze's walls and rng. Returns (current, stack, visited)."""
+    with open_checkpoint(path, KIND_GENERATE, maze) as f:
+        file_checksum, = UINT.unpack(f.read(UINT.size))
+        if file_checksum != checksum:
+            raise ValueError(f"{path} was saved by a run started from a different RNG state")
+        read_rng(f, rng)
+        indices = read_uints(f)
+        count = maze.width * maze.height
+        visited = bytearray(unpack_bits(read_bytes(f), count))
+        opened = read_bytes(f)
+        if len(opened) != count:
+            raise ValueError(f"{path} has walls for {len(opened)} cells, not {count}")
+
+    maze.open[:] = opened
+    return indices[0], list(indices[1:]), visited
+
+# --- Solver State ---
+
+def save_solve(path, maze, checksum, step, stack):
+    """Saves a Maze.solve() search: step counter, stack and every cell's step number."""
+    height = maze.height
+
+    def write_body(f):
+        f.write(UINT.pack(checksum))
+        f.write(UINT.pack(step))
+        write_uints(f, [cell.x * height + cell.y for cell in stack])
+        write_uints(f, [cell.step_number or 0 for cell in maze.cell_list])
+
+    save(path, KIND_SOLVE, maze, write_body)
+
+def load_solve(path, maze, checksum):
+    """Restores a solve checkpoint into maze's step numbers. Returns (step, stack)."""
+    with open_checkpoint(path, KIND_SOLVE, maze) as f:
+        file_checksum, = UINT.unpack(f.read(UINT.size))
+        if file_checksum != checksum:
+            raise ValueError(f"{path} was saved while solving a different maze")
+        step, = UINT.unpack(f.read(UINT.size))
+        indices = read_uints(f)
+        step_numbers = read_uints(f)
+
+    cells = maze.cell_list
+    for cell, number in zip(cells, step_numbers):
+        cell.step_number = number or None
+    return step, [cells[i] for i in indices]
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from maze_service import HOST, PORT, SOLVERS
+
+# Load generator for maze_service.py: `clients` connections each send `requests`
+# maze requests, most of them for a small set of popular seeds, then it reports
+# requests per second, latency and the server's cache hit rate.
+#
+#   python maze_load_client.py --clients 100 --requests 50 --size 30
+
+POPULAR_SEEDS = 20 # Seeds 0..19 get most of the traffic
+POPULAR_SHARE = 0.8
+ALL_SEEDS = 100_000
+
+async def request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+    return response
+
+def pick_seed(rng):
+    if rng.random() < POPULAR_SHARE:
+        return rng.randrange(POPULAR_SEEDS)
+    return rng.randrange(ALL_SEEDS)
+
+async def client(host, port, requests, size, rng, latencies):
+    """One client: sends `requests` maze requests in a row, recording each round trip."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            message = {'op': 'maze', 'width': size, 'height': size,
+                       'seed': pick_seed(rng), 'solver': rng.choice(sorted(SOLVERS))}
+            start = time.perf_counter()
+            await request(reader, writer, message)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+async def run(host, port, clients, requests, size, seed):
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, size, random.Random(rng.getrandbits(64)), latencies)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    stats = await request(reader, writer, {'op': 'stats'})
+    writer.close()
+    await writer.wait_closed()
+
+    latencies.sort()
+    print(f"{clients} clients x {requests} requests ({size}x{size}): {len(latencies)} mazes in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} mazes/s)")
+    print(f"latency p50 {percentile(latencies, 0.50) * 1000:.2f} ms   "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms   max {latencies[-1] * 1000:.2f} ms")
+    print(f"server: {stats['builds']} builds, {stats['shared_waits']} shared waits, {stats['cache_entries']} cached mazes "
+          f"({stats['cache_bytes'] / 1024:.0f} KiB), hit rate {stats['hit_rate'] * 100:.1f}%")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for the maze service.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--clients', type=int, default=100, help="concurrent connections")
+    parser.add_argument('--requests', type=int, default=50, help="requests per client")
+    parser.add_argument('--size', type=int, default=30, help="maze width and height")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.host, args.port, args.clients, args.requests, args.size, args.seed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import asyncio
+import functools
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from maze import Maze, WALL_BITS
+
+# Local asyncio service that generates and solves mazes on request.
+# Protocol: one JSON object per line over TCP, one response line per request.
+#   {"op": "maze", "width": 20, "height": 20, "seed": 7, "solver": "bfs"}
+#       -> {"width", "height", "seed", "solver", "walls", "path", "stats"}
+#   {"op": "stats"} -> requests, builds, shared waits, cache hits/misses/hit rate, entries, bytes
+# walls: one int per cell, row by row (index y * width + x), with a bit set
+# for every closed wall (maze.WALL_BITS: 1 north, 2 east, 4 south, 8 west). path: [x, y] cells from the start (0, 0) to the end.
+# Errors come back as {"error": "..."}; a line over 64 KiB also closes the connection.
+#
+# Mazes are cached (LRU, capped in bytes) as ready-to-send JSON, so a repeated
+# request is one dict lookup and one socket write. Misses run in a process pool.
+#
+#   python maze_service.py --port 8766 --cache-mb 64
+#   python maze_load_client.py --port 8766 --clients 100
+
+# --- Settings ---
+HOST = '127.0.0.1'
+PORT = 8766
+CACHE_MB = 64 # Memory cap for cached responses
+MAX_SIDE = 500 # Largest width/height accepted (a 500x500 maze takes a few seconds)
+BACKLOG = 4096 # Pending connections; load tests open many at once
+ENTRY_OVERHEAD = 200 # Bytes charged per cache entry on top of the response (key, links)
+
+ALL_WALLS = sum(WALL_BITS.values())
+SOLVERS = {'dfs': functools.partial(Maze.solve, fast=True), 'bfs': Maze.solve_bfs}
+
+# --- Mazes (runs in the process pool) ---
+
+def build_maze(width, height, seed, solver):
+    """Generates the maze for seed, solves it and returns the encoded response line."""
+    start = time.perf_counter()
+    maze = Maze(width, height)
+    maze.generate(random.Random(seed))
+    generated = time.perf_counter()
+    path = SOLVERS[solver](maze)
+    solved = time.perf_counter()
+
+    walls = [ALL_WALLS ^ maze.open[x * height + y] for y in range(height) for x in range(width)]
+    visited = sum(cell.step_number is not None for column in maze.cells for cell in column)
+    response = {
+        'width': width, 'height': height, 'seed': seed, 'solver': solver,
+        'walls': walls,
+        'path': [[cell.x, cell.y] for cell in reversed(path)],
+        'stats': {'visited': visited, 'path_length': len(path),
+                  'generate_ms': (generated - start) * 1000, 'solve_ms': (solved - generated) * 1000},
+    }
+    return json.dumps(response, separators=(',', ':')).encode() + b'\n'
+
+def maze_key(request):
+    """Validated (width, height, seed, solver) for a maze request. Raises ValueError."""
+    width, height, seed = int(request['width']), int(request['height']), int(request['seed'])
+    solver = request.get('solver', 'dfs')
+    if not (1 <= width <= MAX_SIDE and 1 <= height <= MAX_SIDE):
+        raise ValueError(f"width and height must be between 1 and {MAX_SIDE}")
+    if solver not in SOLVERS:
+        raise ValueError(f"unknown solver {solver!r}, expected one of {sorted(SOLVERS)}")
+    return width, height, seed, solver
+
+# --- Cache ---
+
+class MazeCache:
+    """LRU map from maze_key to the encoded response, capped at max_bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0 # Bytes charged for the current entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        line = self.entries.get(key)
+        if line is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return line
+
+    def put(self, key, line):
+        cost = len(line) + ENTRY_OVERHEAD
+        if cost > self.max_bytes or key in self.entries:
+            return # Too big to keep, or already cached
+        self.entries[key] = line
+        self.size += cost
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted) + ENTRY_OVERHEAD
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+# --- Server ---
+
+class MazeServer:
+    def __init__(self, executor, cache_bytes=CACHE_MB * 1024 * 1024):
+        self.executor = executor
+        self.cache = MazeCache(cache_bytes)
+        self.pending = {} # maze_key -> Task, so one build serves every client waiting on it
+        self.requests = 0
+        self.builds = 0
+        self.shared_waits = 0 # Lookups answered by joining a build already in flight
+
+    async def maze(self, key):
+        """Encoded response for key: from the cache, else from a (shared) build in the pool."""
+        task = self.pending.get(key)
+        if task is not None:
+            # Checked before the cache, so a wait on a build in flight is not a cache miss
+            self.shared_waits += 1
+        else:
+            line = self.cache.get(key)
+            if line is not None:
+                return line
+            task = asyncio.ensure_future(self._build(key))
+            self.pending[key] = task
+        # shield: a client disconnecting must not cancel a build others wait on
+        return await asyncio.shield(task)
+
+    async def _build(self, key):
+        try:
+            self.builds += 1
+            loop = asyncio.get_running_loop()
+            line = await loop.run_in_executor(self.executor, build_maze, *key)
+            self.cache.put(key, line)
+            return line
+        finally:
+            del self.pending[key]
+
+    def stats(self):
+        return {'requests': self.requests, 'builds': self.builds, 'shared_waits': self.shared_waits,
+                'cache_hits': self.cache.hits, 'cache_misses': self.cache.misses,
+                'hit_rate': self.cache.hit_rate(), 'cache_entries': len(self.cache.entries),
+                'cache_bytes': self.cache.size, 'cache_max_bytes': self.cache.max_bytes}
+
+    async def dispatch(self, request):
+        """Response line (bytes) for one request."""
+        op = request['op']
+        if op == 'maze':
+            self.requests += 1
+            return await self.maze(maze_key(request))
+        if op == 'stats':
+            return json.dumps(self.stats()).encode() + b'\n'
+        raise ValueError(f"unknown op {op!r}")
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError: # Over the stream limit (LimitOverrunError is wrapped in it)
+                    writer.write(json.dumps({'error': "request line too long"}).encode() + b'\n')
+                    await writer.drain()
+                    break # The rest of the line is still coming, so the framing is lost
+                if not line:
+                    break
+                try:
+                    response = await self.dispatch(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    response = json.dumps({'error': str(e)}).encode() + b'\n'
+                writer.write(response)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def serve(host, port, workers, cache_mb):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        maze_server = MazeServer(executor, int(cache_mb * 1024 * 1024))
+        server = await asyncio.start_server(maze_server.handle_client, host, port, backlog=BACKLOG)
+        print(f"Serving mazes on {host}:{port} with {workers} workers and a {cache_mb} MB cache")
+        async with server:
+            await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asyncio maze generation/solving service with an LRU cache.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="maze building processes")
+    parser.add_argument('--cache-mb', type=float, default=CACHE_MB, help="memory cap for cached mazes")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_mb))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import argparse
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from maze import Maze, NORTH, EAST, SOUTH, WEST, inside_sides
+
+# Multi-core maze generation by region stitching:
+#  1. the grid is cut into REGION_SIZE x REGION_SIZE rectangles (smaller at the edges),
+#  2. every region is carved into its own perfect maze (recursive backtracker) in a
+#     pool process, from a seed derived from the main one, straight into shared memory,
+#  3. a random spanning tree over the regions picks which neighboring regions to join,
+#     and exactly one wall is opened on the boundary of each joined pair.
+# Each region is a tree of cells and the joins form a tree of regions, so the whole
+# maze is a tree too: a perfect maze. The region layout and seeds depend only on the
+# seed and region size, so the maze is the same for any number of workers.
+#
+#   python parallel_maze.py --size 2000 --workers 8 --check
+
+# --- Settings ---
+REGION_SIZE = 128 # Region width/height; several regions per worker keeps all cores busy
+
+# Cells are one byte each, indexed x * height + y (the order of Maze.cells),
+# with a bit set for every open side: the same layout as Maze.open
+OPPOSITE = {NORTH: SOUTH, EAST: WEST, SOUTH: NORTH, WEST: EAST}
+
+# --- Regions (runs in the process pool) ---
+
+def carve_region(shm_name, height, x0, y0, region_w, region_h, seed):
+    """Carves a perfect maze into the region's cells of the shared grid."""
+    rng = random.Random(seed)
+    # Carve into a local column-major copy first (fast bytearray access), then
+    # copy it over column by column: each region column is contiguous in the grid
+    local = bytearray(region_w * region_h)
+    visited = bytearray(region_w * region_h)
+    inside = inside_sides(region_w, region_h) # Sides that stay in the region
+    stack = [0]
+    visited[0] = 1
+    while stack:
+        i = stack[-1]
+        sides = inside[i]
+        options = [] # Unvisited neighbors in DIRECTIONS order, as in Maze.generate()
+        if sides & NORTH and not visited[i - 1]:
+            options.append((NORTH, i - 1))
+        if sides & EAST and not visited[i + region_h]:
+            options.append((EAST, i + region_h))
+        if sides & SOUTH and not visited[i + 1]:
+            options.append((SOUTH, i + 1))
+        if sides & WEST and not visited[i - region_h]:
+            options.append((WEST, i - region_h))
+        if not options:
+            stack.pop()
+            continue
+        side, j = rng.choice(options)
+        local[i] |= side
+        local[j] |= OPPOSITE[side]
+        visited[j] = 1
+        stack.append(j)
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        for x in range(region_w):
+            start = (x0 + x) * height + y0
+            shm.buf[start:start + region_h] = local[x * region_h:(x + 1) * region_h]
+    finally:
+        shm.close()
+
+def split_regions(width, height, region_size):
+    """[(x0, y0, w, h)] for the region grid, column by column, and its (columns, rows)."""
+    xs = list(range(0, width, region_size))
+    ys = list(range(0, height, region_size))
+    regions = [(x0, y0, min(region_size, width - x0), min(region_size, height - y0)) for x0 in xs for y0 in ys]
+    return regions, (len(xs), len(ys))
+
+# --- Stitching ---
+
+def region_tree(columns, rows, rng):
+    """Random spanning tree of the columns x rows region grid as (a, b) index pairs, a left of/above b."""
+    visited = {0}
+    stack, edges = [0], []
+    while stack:
+        r = stack[-1]
+        rx, ry = divmod(r, rows)
+        options = [n for n, ok in ((r - 1, ry > 0), (r + rows, rx < columns - 1),
+                                   (r + 1, ry < rows - 1), (r - rows, rx > 0)) if ok and n not in visited]
+        if not options:
+            stack.pop()
+            continue
+        n = rng.choice(options)
+        visited.add(n)
+        edges.append((min(r, n), max(r, n)))
+        stack.append(n)
+    return edges
+
+def stitch(cells, height, regions, edges, rng):
+    """Opens one random wall on the shared boundary of every pair of joined regions."""
+    for a, b in edges:
+        x0, y0, w, h = regions[a]
+        if regions[b][0] == x0: # b is below a: open a south wall on a's bottom row
+            x, y, side = x0 + rng.randrange(w), y0 + h - 1, SOUTH
+            neighbor = x * height + y + 1
+        else: # b is right of a: open an east wall on a's right column
+            x, y, side = x0 + w - 1, y0 + rng.randrange(h), EAST
+            neighbor = (x + 1) * height + y
+        cells[x * height + y] |= side
+        cells[neighbor] |= OPPOSITE[side]
+
+# --- Generation ---
+
+def generate_parallel(width, height, seed, workers=None, region_size=REGION_SIZE):
+    """
+    Generates a perfect width x height maze on `workers` processes.
+    Returns the cells as bytes (see NORTH/EAST/SOUTH/WEST); to_maze() turns them into a Maze.
+    """
+    rng = random.Random(seed)
+    regions, (columns, rows) = split_regions(width, height, region_size)
+    seeds = [rng.getrandbits(64) for _ in regions]
+
+    shm = shared_memory.SharedMemory(create=True, size=width * height)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Biggest regions first, so the small edge regions fill in at the end
+            order = sorted(range(len(regions)), key=lambda r: -regions[r][2] * regions[r][3])
+            futures = [executor.submit(carve_region, shm.name, height, *regions[r], seeds[r]) for r in order]
+            for future in futures:
+                future.result()
+        cells = bytearray(shm.buf[:width * height])
+    finally:
+        shm.close()
+        shm.unlink()
+
+    stitch(cells, height, regions, region_tree(columns, rows, rng), rng)
+    return bytes(cells)
+
+def to_maze(width, height, cells):
+    """Maze object (for solving/drawing with maze.py) from generate_parallel() cells."""
+    maze = Maze(width, height)
+    maze.open[:] = cells # The cells' walls are views of this
+    for cell in maze.cell_list:
+        cell.visited = True
+    return maze
+
+def is_perfect(width, height, cells):
+    """True if exactly width * height - 1 passages connect every cell (a spanning tree)."""
+    passages = sum(bin(value & (EAST | SOUTH)).count('1') for value in cells)
+    if passages != width * height - 1:
+        return False
+    seen = bytearray(width * height)
+    seen[0] = 1
+    queue, count = deque([0]), 1
+    while queue:
+        i = queue.popleft()
+        for side, step in ((NORTH, -1), (SOUTH, 1), (EAST, height), (WEST, -height)):
+            if cells[i] & side and not seen[i + step]:
+                seen[i + step] = 1
+                count += 1
+                queue.append(i + step)
+    return count == width * height
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a large maze on several cores by region stitching.")
+    parser.add_argument('--size', type=int, default=1000, help="maze width and height")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--region-size', type=int, default=REGION_SIZE)
+    parser.add_argument('--check', action='store_true', help="verify the result is a perfect maze")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    cells = generate_parallel(args.size, args.size, args.seed, args.workers, args.region_size)
+    elapsed = time.perf_counter() - start
+    print(f"{args.size}x{args.size} maze on {args.workers} workers in {elapsed:.2f}s "
+          f"({args.size * args.size / elapsed / 1e6:.2f}M cells/s)")
+    if args.check:
+        print("perfect maze" if is_perfect(args.size, args.size, cells) else "NOT a perfect maze")
+
+if __name__ == "__main__":
+    main()
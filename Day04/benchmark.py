@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from mcts import MCTSAgent
+from search_stats import SearchStats
+from tictactoe import (BOARD_ROWS, BOARD_COLS, WIN_LENGTH, PLAYER_X, PLAYER_O, new_board,
+                       available_squares, check_winner, is_board_full, find_best_move, find_best_move_mcts)
+import tictactoe_numeric
+
+# Times every tic-tac-toe engine on a fixed set of positions (AI, 'O', to move),
+# appends passing runs to a JSON history file and fails when an engine got slower
+# than its baseline, the median of the last BASELINE_RUNS saved runs, by more than
+# the threshold. Failing runs are not saved, so a regression never becomes the baseline.
+#
+#   python benchmark.py                          # all engines, save if passing, check
+#   python benchmark.py --engines minimax --repeat 5 --threshold 0.2
+#   python benchmark.py --no-save                # just print
+#   python benchmark.py --memory                 # also peak memory (slow: tracemalloc)
+
+# --- Settings ---
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_history.json')
+THRESHOLD = 0.15 # Fail if total time to move grows by more than 15% (timer noise is a few %)
+REPEAT = 3 # Timed runs per position; the fastest one counts
+BASELINE_RUNS = 5 # Saved runs whose median total time is the baseline
+MIDGAME_SAMPLES = 8
+POSITIONS_SEED = 2024 # Fixed so every run benchmarks the same midgame positions
+MCTS_ITERATIONS = 2000 # Fixed budget (not time) so MCTS work is comparable between runs
+
+# --- Positions ---
+
+def midgame_positions(count, seed):
+    """Random non-terminal positions with 3 or 5 marks on the board and O to move."""
+    rng = random.Random(seed)
+    positions, seen = [], set()
+    while len(positions) < count:
+        board = new_board()
+        plies = rng.choice((3, 5))
+        for ply in range(plies):
+            r, c = rng.choice(available_squares(board))
+            board[r][c] = PLAYER_X if ply % 2 == 0 else PLAYER_O
+        key = str(board)
+        if check_winner(board) or is_board_full(board) or key in seen:
+            continue
+        seen.add(key)
+        positions.append(board)
+    return positions
+
+def benchmark_positions(midgame_samples=MIDGAME_SAMPLES, seed=POSITIONS_SEED):
+    """Returns [(name, board)]: the empty board, all 9 one-move openings and midgame samples."""
+    positions = [('empty', new_board())]
+    for r in range(BOARD_ROWS):
+        for c in range(BOARD_COLS):
+            board = new_board()
+            board[r][c] = PLAYER_X
+            positions.append((f'opening_{r}{c}', board))
+    for i, board in enumerate(midgame_positions(midgame_samples, seed)):
+        positions.append((f'midgame_{i}', board))
+    return positions
+
+# --- Engines ---
+# Each engine takes a board ('X'/'O'/'' rows, O to move) and a SearchStats
+# and returns the (row, col) it picked.
+
+def to_numeric(board):
+    """tictactoe_numeric / MCTS board: 0 empty, 1 for X, 2 for O."""
+    return [[{PLAYER_X: 1, PLAYER_O: 2}.get(value, 0) for value in row] for row in board]
+
+def engine_minimax(board, stats):
+    return find_best_move([row[:] for row in board], stats=stats)
+
+def engine_minimax_day4_2(board, stats):
+    return tictactoe_numeric.ai_move(to_numeric(board), stats)
+
+def engine_mcts(board, stats):
+    agent = MCTSAgent(BOARD_ROWS, BOARD_COLS, WIN_LENGTH, iterations=MCTS_ITERATIONS,
+                      time_limit=None, workers=1, seed=0)
+    return find_best_move_mcts(board, agent, stats=stats)
+
+ENGINES = {
+    'minimax': engine_minimax,
+    'minimax_day4_2': engine_minimax_day4_2,
+    'mcts': engine_mcts,
+}
+
+# --- Measuring ---
+
+def measure(engine, board, repeat):
+    """Runs engine on board `repeat` times and keeps the fastest run."""
+    best = None
+    for _ in range(repeat):
+        stats = SearchStats('bench')
+        start = time.perf_counter()
+        move = engine(board, stats)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, move, stats)
+    elapsed, move, stats = best
+    return {
+        'move': list(move) if move else None,
+        'time': elapsed,
+        'nodes': stats.nodes,
+        'nodes_per_second': stats.nodes / elapsed if elapsed > 0 else 0.0,
+    }
+
+def peak_memory(engine, board):
+    """Peak Python memory (KiB) of one untimed run; tracemalloc slows the search ~10x."""
+    tracemalloc.start()
+    engine(board, SearchStats('bench'))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+def run_engine(name, positions, repeat, memory=False):
+    engine = ENGINES[name]
+    results = {position: measure(engine, board, repeat) for position, board in positions}
+    total_time = sum(r['time'] for r in results.values())
+    total_nodes = sum(r['nodes'] for r in results.values())
+    return {
+        'total_time': total_time,
+        'total_nodes': total_nodes,
+        'nodes_per_second': total_nodes / total_time if total_time > 0 else 0.0,
+        # Opt-in: measured on the first position (the empty board), the biggest search
+        'peak_kib': peak_memory(engine, positions[0][1]) if memory else None,
+        'positions': results,
+    }
+
+# --- History ---
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+def save_history(path, history):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path) # Never leave a half-written history behind
+
+def find_regressions(history, run, threshold, baseline_runs=BASELINE_RUNS):
+    """
+    Compares each engine in run with its baseline: the median total time of its
+    last baseline_runs results in history (same config). The median keeps one
+    noisy run from moving the baseline. Returns [(engine, baseline, new time)]
+    for the engines that got slower than that by more than threshold.
+    """
+    regressions = []
+    for name, result in run['engines'].items():
+        times = [previous['engines'][name]['total_time'] for previous in history
+                 if previous.get('config') == run['config'] and name in previous['engines']]
+        if not times:
+            continue
+        baseline = statistics.median(times[-baseline_runs:])
+        if result['total_time'] > baseline * (1 + threshold):
+            regressions.append((name, baseline, result['total_time']))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Day04 tic-tac-toe engines.")
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=list(ENGINES))
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="timed runs per position (best counts)")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="allowed slowdown vs the baseline, e.g. 0.1 for 10%%")
+    parser.add_argument('--baseline-runs', type=int, default=BASELINE_RUNS,
+                        help="saved runs whose median is the baseline")
+    parser.add_argument('--history', default=HISTORY_FILE, help="JSON history file")
+    parser.add_argument('--no-save', action='store_true', help="don't append this run to the history")
+    parser.add_argument('--save-failing', action='store_true',
+                        help="append this run even if it regressed (e.g. to accept a deliberate slowdown)")
+    parser.add_argument('--memory', action='store_true', help="also measure peak memory (reruns the empty board)")
+    args = parser.parse_args(argv)
+
+    positions = benchmark_positions()
+    run = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        # Results are only compared between runs with the same config, so a shared
+        # history never measures one host or interpreter against another
+        'config': {'positions': len(positions), 'seed': POSITIONS_SEED, 'mcts_iterations': MCTS_ITERATIONS,
+                   'machine': f"{platform.node()} {platform.machine()}",
+                   'python': f"{platform.python_implementation()} {platform.python_version()}"},
+        'engines': {},
+    }
+
+    print(f"{'engine':<16}{'time (s)':>10}{'nodes':>12}{'nodes/s':>12}{'peak KiB':>10}")
+    for name in args.engines:
+        result = run_engine(name, positions, args.repeat, args.memory)
+        run['engines'][name] = result
+        peak = f"{result['peak_kib']:.1f}" if result['peak_kib'] is not None else '-'
+        print(f"{name:<16}{result['total_time']:>10.3f}{result['total_nodes']:>12}"
+              f"{result['nodes_per_second']:>12.0f}{peak:>10}")
+
+    history = load_history(args.history)
+    regressions = find_regressions(history, run, args.threshold, args.baseline_runs)
+    if not args.no_save and (not regressions or args.save_failing):
+        history.append(run)
+        save_history(args.history, history)
+
+    for name, old, new in regressions:
+        print(f"REGRESSION: {name} took {new:.3f}s, baseline {old:.3f}s (+{(new / old - 1) * 100:.0f}%)")
+    if regressions and not args.no_save and not args.save_failing:
+        print("Run not saved (use --save-failing to keep it)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
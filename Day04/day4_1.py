@@ -1,13 +1,21 @@
-import pygame
 import sys
 import time # Used for pausing at game end
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from mcts import MCTSAgent
+from search_stats import SearchStats, log_move
+from tictactoe import (BOARD_ROWS, BOARD_COLS, WIN_LENGTH, PLAYER_X, PLAYER_O, new_board, mark_square,
+                       is_board_full, check_winner, find_best_move, find_best_move_mcts)
+
+# pygame is imported in main(), so importing this module (e.g. from a pool
+# worker or a test) never loads SDL or opens a window.
+pygame = None
 
 # --- Constants ---
 WIDTH = 300
 HEIGHT = 300
 LINE_WIDTH = 5
-BOARD_ROWS = 3
-BOARD_COLS = 3
 SQUARE_SIZE = WIDTH // BOARD_COLS
 CIRCLE_RADIUS = SQUARE_SIZE // 3
 CIRCLE_WIDTH = 8 # Slightly thicker for visibility
@@ -20,22 +28,73 @@ LINE_COLOR = (23, 145, 135)
 CIRCLE_COLOR = (239, 231, 200) # White-ish
 CROSS_COLOR = (66, 66, 66)    # Dark Grey
 TEXT_COLOR = (10, 80, 75) # Darker color for text
-
-# Player representation
-PLAYER_X = 'X'
-PLAYER_O = 'O' # AI is 'O'
-
-# --- Pygame Setup ---
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Tic Tac Toe - Minimax")
-font = pygame.font.SysFont(None, 40) # Font for messages
+THINKING_COLOR = (239, 231, 200)
+FPS = 60 # Indicator refresh rate while the AI thinks; the loop sleeps otherwise
+THINKING_HEIGHT = 28 # Height of the strip under the board for the thinking indicator
+STATS_HEIGHT = 4 * 16 + 8 # Strip under the board for up to 4 stats lines (only with SHOW_STATS)
+
+# AI engine: 'minimax' (exact, 3x3 only in practice) or 'mcts' (any board size)
+AI_ENGINE = 'minimax'
+MCTS_TIME_LIMIT = 1.0 # Seconds of thinking per MCTS move
+MCTS_ITERATIONS = None # Or a fixed number of playouts per move
+MCTS_WORKERS = os.cpu_count() # Root-parallel searches, one process each
+
+# Search instrumentation (off by default; when off it costs one check per node)
+SHOW_STATS = False # Overlay the last AI move's search stats in the window
+STATS_LOG = None # Path of a JSON-lines file to append one record per AI move, e.g. 'search_log.jsonl'
+
+# Screen areas (x, y, width, height) that get repainted on their own
+# Both strips sit below the board, so they never hide a mark
+THINKING_RECT = (0, HEIGHT, WIDTH, THINKING_HEIGHT)
+STATS_RECT = (0, HEIGHT + THINKING_HEIGHT, WIDTH, STATS_HEIGHT)
+
+# --- Pygame Objects (created in setup_display) ---
+screen = None
+font = None # Font for messages
+small_font = None # Font for the thinking indicator
+stats_font = None # Font for the search stats overlay
+AI_DONE_EVENT = None # Posted by the worker thread to wake the loop
+SPRITES = None # Pre-rendered X and O
+
+def make_sprites():
+    """Pre-renders one square-sized X and O so marks are a single blit."""
+    x_sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+    # Descending line \ and ascending line /
+    pygame.draw.line(x_sprite, CROSS_COLOR, (SPACE, SPACE), (SQUARE_SIZE - SPACE, SQUARE_SIZE - SPACE), CROSS_WIDTH)
+    pygame.draw.line(x_sprite, CROSS_COLOR, (SPACE, SQUARE_SIZE - SPACE), (SQUARE_SIZE - SPACE, SPACE), CROSS_WIDTH)
+    o_sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+    pygame.draw.circle(o_sprite, CIRCLE_COLOR, (SQUARE_SIZE // 2, SQUARE_SIZE // 2), CIRCLE_RADIUS, CIRCLE_WIDTH)
+    return {PLAYER_X: x_sprite.convert_alpha(), PLAYER_O: o_sprite.convert_alpha()}
+
+def setup_display():
+    """Imports and starts pygame, opens the window and builds fonts and sprites."""
+    global pygame, screen, font, small_font, stats_font, AI_DONE_EVENT, SPRITES
+    import pygame
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT + THINKING_HEIGHT + (STATS_HEIGHT if SHOW_STATS else 0)))
+    pygame.display.set_caption("Tic Tac Toe - Minimax (R: new game)")
+    font = pygame.font.SysFont(None, 40)
+    small_font = pygame.font.SysFont(None, 24)
+    stats_font = pygame.font.SysFont(None, 20)
+    AI_DONE_EVENT = pygame.event.custom_type()
+    SPRITES = make_sprites()
 
 # --- Game Variables ---
 board = None # Initialize in reset_game
 player_turn = None # 1 for Player X, 2 for Player O (AI)
 game_over = None
 winner = None
+end_message_shown = None
+dirty_rects = [] # Screen areas repainted since the last display update
+
+# --- Background AI Search ---
+ai_executor = None # ThreadPoolExecutor(max_workers=1), started in main()
+ai_future = None # Future for the search in flight (None when idle)
+ai_cancel = None # threading.Event used to stop the search in flight
+ai_started = None # time.perf_counter() when the search was submitted
+ai_stats = None # SearchStats filled in by the search in flight (None when instrumentation is off)
+mcts_agent = None # Created on the first MCTS move; keeps its tree between moves
+last_stats = None # SearchStats of the AI's last move (only when instrumentation is on)
 
 # --- Functions ---
 
@@ -53,127 +112,75 @@ def draw_figures():
     """Draws the X's and O's on the board based on the board state."""
     for row in range(BOARD_ROWS):
         for col in range(BOARD_COLS):
-            if board[row][col] == PLAYER_X:
-                # Draw descending line \
-                start_desc = (col * SQUARE_SIZE + SPACE, row * SQUARE_SIZE + SPACE)
-                end_desc = (col * SQUARE_SIZE + SQUARE_SIZE - SPACE, row * SQUARE_SIZE + SQUARE_SIZE - SPACE)
-                pygame.draw.line(screen, CROSS_COLOR, start_desc, end_desc, CROSS_WIDTH)
-                # Draw ascending line /
-                start_asc = (col * SQUARE_SIZE + SPACE, row * SQUARE_SIZE + SQUARE_SIZE - SPACE)
-                end_asc = (col * SQUARE_SIZE + SQUARE_SIZE - SPACE, row * SQUARE_SIZE + SPACE)
-                pygame.draw.line(screen, CROSS_COLOR, start_asc, end_asc, CROSS_WIDTH)
-            elif board[row][col] == PLAYER_O:
-                center = (int(col * SQUARE_SIZE + SQUARE_SIZE // 2), int(row * SQUARE_SIZE + SQUARE_SIZE // 2))
-                pygame.draw.circle(screen, CIRCLE_COLOR, center, CIRCLE_RADIUS, CIRCLE_WIDTH)
-
-def mark_square(row, col, player_symbol):
-    """Marks a square on the board if it's available."""
-    if board[row][col] == '':
-        board[row][col] = player_symbol
-        return True
-    return False
-
-def available_squares():
-    """Returns a list of tuples (row, col) for all empty squares."""
-    return [(r, c) for r in range(BOARD_ROWS) for c in range(BOARD_COLS) if board[r][c] == '']
-
-def is_board_full():
-    """Checks if the board has any empty squares left."""
-    return len(available_squares()) == 0
-
-def check_winner(current_board=None):
-    """
-    Checks if there is a winner on the given board (or the global board if None).
-    Returns the winning player's symbol ('X' or 'O') or None.
-    """
-    b = current_board if current_board else board # Use provided board or global one
+            sprite = SPRITES.get(board[row][col])
+            if sprite:
+                screen.blit(sprite, (col * SQUARE_SIZE, row * SQUARE_SIZE))
 
-    # Check rows
-    for row in range(BOARD_ROWS):
-        if b[row][0] == b[row][1] == b[row][2] != '':
-            return b[row][0]
-    # Check columns
-    for col in range(BOARD_COLS):
-        if b[0][col] == b[1][col] == b[2][col] != '':
-            return b[0][col]
-    # Check diagonals
-    if b[0][0] == b[1][1] == b[2][2] != '':
-        return b[0][0]
-    if b[0][2] == b[1][1] == b[2][0] != '':
-        return b[0][2]
-
-    return None # No winner
-
-# --- AI Logic (Minimax) ---
-
-def evaluate_board():
-    """Evaluates the current board state for the minimax algorithm."""
-    winner = check_winner(board)
-    if winner == PLAYER_O:
-        return 1  # AI wins
-    elif winner == PLAYER_X:
-        return -1 # Player wins
-    elif is_board_full():
-        return 0  # Draw
-    else:
-        return None # Game not finished
-
-def minimax(current_board, depth, is_maximizing):
-    """
-    Minimax algorithm implementation.
-    - is_maximizing: True if it's AI's turn (O), False if Player's turn (X).
-    - Returns the best score achievable from the current state.
-    """
-    score = evaluate_board()
-    if score is not None: # Base case: Game over or draw
-        return score
-
-    moves = available_squares() # Use the global board's available squares here
-
-    if is_maximizing: # AI's turn (O) - maximize the score
-        best_score = -float('inf')
-        for r, c in moves:
-            current_board[r][c] = PLAYER_O
-            current_score = minimax(current_board, depth + 1, False) # Switch to minimizing
-            current_board[r][c] = '' # Undo the move
-            best_score = max(best_score, current_score)
-        return best_score
-    else: # Player's turn (X) - minimize the score
-        best_score = float('inf')
-        for r, c in moves:
-            current_board[r][c] = PLAYER_X
-            current_score = minimax(current_board, depth + 1, True) # Switch to maximizing
-            current_board[r][c] = '' # Undo the move
-            best_score = min(best_score, current_score)
-        return best_score
-
-def find_best_move():
+def redraw_region(rect):
     """
-    Finds the best move for the AI (Player O) using the minimax algorithm.
-    Returns the best (row, col) tuple for the AI to move to.
+    Repaints only rect (grid, marks and the thinking indicator, clipped)
+    and queues it for the next display update.
     """
-    best_score = -float('inf')
-    best_move = None
-    moves = available_squares()
-
-    if not moves: # Should not happen if called correctly, but safety check
-        return None
-
-    for r, c in moves:
-        board[r][c] = PLAYER_O # Try the move
-        score = minimax(board, 0, False) # Evaluate starting from opponent's perspective
-        board[r][c] = '' # Undo the move
-
-        if score > best_score:
-            best_score = score
-            best_move = (r, c)
-
-    return best_move
+    screen.set_clip(rect)
+    draw_lines()
+    draw_figures()
+    if ai_future is not None:
+        draw_thinking_indicator()
+    if SHOW_STATS and last_stats is not None:
+        draw_stats_overlay()
+    screen.set_clip(None)
+    dirty_rects.append(rect)
+
+def redraw_square(row, col):
+    """Repaints a single board square after it has been marked."""
+    redraw_region((col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+
+def find_best_move_mcts_ui(current_board, cancel=None, stats=None):
+    """Runs find_best_move_mcts with this game's agent (speed shows in SHOW_STATS / STATS_LOG)."""
+    global mcts_agent
+    if mcts_agent is None:
+        mcts_agent = MCTSAgent(BOARD_ROWS, BOARD_COLS, WIN_LENGTH, iterations=MCTS_ITERATIONS,
+                               time_limit=MCTS_TIME_LIMIT, workers=MCTS_WORKERS)
+    return find_best_move_mcts(current_board, mcts_agent, cancel, stats)
+
+# --- Background AI Search ---
+
+def start_ai_search():
+    """Submits the AI_ENGINE search on a copy of the board to the worker thread."""
+    global ai_future, ai_cancel, ai_started, ai_stats
+    ai_cancel = threading.Event()
+    ai_started = time.perf_counter()
+    ai_stats = SearchStats(AI_ENGINE) if SHOW_STATS or STATS_LOG else None
+    board_copy = [row[:] for row in board] # The worker never touches the live board
+    search = find_best_move_mcts_ui if AI_ENGINE == 'mcts' else find_best_move
+    ai_future = ai_executor.submit(search, board_copy, ai_cancel, ai_stats)
+    # Wake the (otherwise sleeping) event loop as soon as the search finishes
+    ai_future.add_done_callback(lambda _: pygame.event.post(pygame.event.Event(AI_DONE_EVENT)))
+
+def cancel_ai_search():
+    """Stops the search in flight (if any); its result is discarded."""
+    global ai_future, ai_cancel, ai_started, ai_stats
+    if ai_future is not None:
+        ai_cancel.set() # Running search bails out at its next node
+        ai_future.cancel() # Queued search never starts
+    ai_future = None
+    ai_cancel = None
+    ai_started = None
+    ai_stats = None
+
+def record_stats(stats, move):
+    """Keeps the finished move's stats for the overlay and appends them to STATS_LOG."""
+    global last_stats
+    last_stats = stats
+    if STATS_LOG:
+        log_move(STATS_LOG, stats, board=board, move=move, rows=BOARD_ROWS, cols=BOARD_COLS)
+    if SHOW_STATS:
+        redraw_region(STATS_RECT)
 
 # --- Game Flow ---
 
-def display_message(message):
-    """Displays a message centered on the screen."""
+def draw_message(message):
+    """Draws a message centered on the screen (no display update)."""
     msg_surface = font.render(message, True, TEXT_COLOR)
     msg_rect = msg_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
     # Add a semi-transparent background for better readability
@@ -181,94 +188,168 @@ def display_message(message):
     bg_rect.fill((200, 200, 200, 180)) # White-ish, semi-transparent
     screen.blit(bg_rect, (msg_rect.left - 10, msg_rect.top - 10))
     screen.blit(msg_surface, msg_rect)
+
+def display_message(message):
+    """Displays a message centered on the screen."""
+    draw_message(message)
     pygame.display.update() # Update only the message area
     time.sleep(0.5) # Small pause before allowing restart
 
-
-def show_end_message():
-    """Determines and displays the end game message."""
+def draw_thinking_indicator():
+    """Draws 'AI thinking...' with the elapsed search time in the strip under the board."""
+    elapsed = time.perf_counter() - ai_started
+    dots = '.' * (int(elapsed * 3) % 4) # Animated so a stalled window is obvious
+    text_surface = small_font.render(f"AI thinking{dots} {elapsed:.1f}s", True, THINKING_COLOR)
+    text_rect = text_surface.get_rect(midleft=(8, HEIGHT + THINKING_HEIGHT // 2))
+    screen.blit(text_surface, text_rect)
+
+def draw_stats_overlay():
+    """Draws the last AI move's search stats in the strip under the board."""
+    lines = last_stats.summary_lines()
+    box = pygame.Surface((WIDTH, len(lines) * 16 + 8), pygame.SRCALPHA)
+    box.fill((0, 0, 0, 140))
+    for i, line in enumerate(lines):
+        box.blit(stats_font.render(line, True, THINKING_COLOR), (6, 4 + i * 16))
+    screen.blit(box, STATS_RECT[:2])
+
+def end_message():
+    """The end game message for the current winner."""
     if winner == PLAYER_X:
-        display_message("You Win!")
+        return "You Win!"
     elif winner == PLAYER_O:
-        display_message("AI Wins!")
+        return "AI Wins!"
     else: # Draw
-        display_message("It's a Draw!")
-    # Add instruction to restart
-    time.sleep(1) # Wait a bit longer
+        return "It's a Draw!"
+
+def draw_restart_instruction():
     instruction_font = pygame.font.SysFont(None, 30)
     instruction_surf = instruction_font.render("Click to Play Again", True, TEXT_COLOR)
     instruction_rect = instruction_surf.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 40))
     screen.blit(instruction_surf, instruction_rect)
+
+def show_end_message():
+    """Determines and displays the end game message."""
+    display_message(end_message())
+    # Add instruction to restart
+    time.sleep(1) # Wait a bit longer
+    draw_restart_instruction()
     pygame.display.update()
 
 def reset_game():
     """Resets the game state for a new round."""
-    global board, player_turn, game_over, winner
-    board = [['' for _ in range(BOARD_COLS)] for _ in range(BOARD_ROWS)]
+    global board, player_turn, game_over, winner, end_message_shown, last_stats
+    cancel_ai_search() # A search for the previous game must not land on the new board
+    last_stats = None
+    board = new_board()
     player_turn = 1 # Player X starts
     game_over = False
     winner = None
+    end_message_shown = False
     draw_lines() # Redraw the initial empty board
+    dirty_rects.append(screen.get_rect())
 
 # --- Main Game Loop ---
-reset_game() # Initialize the first game
-running = True
-
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            # If game is over, a click restarts the game
-            if game_over:
-                reset_game()
-                continue # Skip the rest of the event handling for this click
-
-            # Player's turn logic
-            if player_turn == 1 and not game_over:
-                mouseX = event.pos[0]
-                mouseY = event.pos[1]
-
-                clicked_col = mouseX // SQUARE_SIZE
-                clicked_row = mouseY // SQUARE_SIZE
-
-                # Check bounds and if square is valid
-                if 0 <= clicked_row < BOARD_ROWS and 0 <= clicked_col < BOARD_COLS:
-                    if mark_square(clicked_row, clicked_col, PLAYER_X):
-                        # Check if player's move ended the game
-                        winner = check_winner()
-                        if winner or is_board_full():
-                            game_over = True
-                        else:
-                            player_turn = 2 # Switch to AI's turn
-
-    # AI's turn logic (outside the event loop to run after player's move)
-    if player_turn == 2 and not game_over:
-        best_move = find_best_move()
-        if best_move:
-            mark_square(best_move[0], best_move[1], PLAYER_O)
-            # Check if AI's move ended the game
-            winner = check_winner()
-            if winner or is_board_full():
-                game_over = True
-            else:
-                player_turn = 1 # Switch back to Player's turn
-
-    # --- Drawing ---
-    # Always redraw the board state unless game just reset (handled in reset_game)
-    if not game_over or (game_over and winner is None and not is_board_full()): # Redraw during play or right before msg
-        draw_lines() # Redraw grid in case messages overlayed it
-        draw_figures()
-
-    # --- Game Over Handling ---
-    if game_over:
-        show_end_message()
-        # The game waits here until the user clicks (handled in MOUSEBUTTONDOWN event)
-
-    # Update the full display
-    pygame.display.update()
 
-# --- Cleanup ---
-pygame.quit()
-sys.exit()
\ No newline at end of file
+def main():
+    """Opens the window and runs the game until it is closed."""
+    global ai_executor, player_turn, game_over, winner, end_message_shown
+    setup_display()
+    ai_executor = ThreadPoolExecutor(max_workers=1) # One search at a time, off the event loop
+    reset_game() # Initialize the first game
+    running = True
+
+    while running:
+        # Sleep until something happens. While the AI thinks, also wake up at FPS
+        # to tick the indicator; AI_DONE_EVENT wakes us the moment the move is ready.
+        if ai_future is not None:
+            first_event = pygame.event.wait(1000 // FPS)
+        else:
+            first_event = pygame.event.wait()
+
+        for event in [first_event] + pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            if event.type == pygame.WINDOWEXPOSED: # Window was uncovered, repaint everything
+                redraw_region(screen.get_rect())
+                if end_message_shown: # The repaint wiped it; put it back without the pauses
+                    draw_message(end_message())
+                    draw_restart_instruction()
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                reset_game() # New game at any time; stops an AI search in flight
+                continue
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                # If game is over, a click restarts the game
+                if game_over:
+                    reset_game()
+                    continue # Skip the rest of the event handling for this click
+
+                # Player's turn logic
+                if player_turn == 1 and not game_over:
+                    mouseX = event.pos[0]
+                    mouseY = event.pos[1]
+
+                    clicked_col = mouseX // SQUARE_SIZE
+                    clicked_row = mouseY // SQUARE_SIZE
+
+                    # Check bounds and if square is valid
+                    if 0 <= clicked_row < BOARD_ROWS and 0 <= clicked_col < BOARD_COLS:
+                        if mark_square(board, clicked_row, clicked_col, PLAYER_X):
+                            redraw_square(clicked_row, clicked_col)
+                            # Check if player's move ended the game
+                            winner = check_winner(board)
+                            if winner or is_board_full(board):
+                                game_over = True
+                            else:
+                                player_turn = 2 # Switch to AI's turn
+
+        # AI's turn logic (outside the event loop to run after player's move)
+        # The search runs on the worker thread; the loop only polls its future.
+        if player_turn == 2 and not game_over:
+            if ai_future is None:
+                start_ai_search()
+            elif ai_future.done():
+                best_move = ai_future.result()
+                stats = ai_stats
+                cancel_ai_search() # Clear the finished search
+                redraw_region(THINKING_RECT) # Erase the indicator
+                if stats is not None:
+                    record_stats(stats, best_move)
+                if best_move:
+                    mark_square(board, best_move[0], best_move[1], PLAYER_O)
+                    redraw_square(best_move[0], best_move[1])
+                    # Check if AI's move ended the game
+                    winner = check_winner(board)
+                    if winner or is_board_full(board):
+                        game_over = True
+                    else:
+                        player_turn = 1 # Switch back to Player's turn
+
+        # --- Drawing ---
+        # Only the indicator strip changes every frame while the AI thinks
+        if ai_future is not None:
+            redraw_region(THINKING_RECT)
+
+        # Push just the repainted areas to the window
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+            dirty_rects.clear()
+
+        # --- Game Over Handling ---
+        if game_over and not end_message_shown:
+            show_end_message()
+            end_message_shown = True
+            # The game waits here until the user clicks (handled in MOUSEBUTTONDOWN event)
+
+    # --- Cleanup ---
+    cancel_ai_search()
+    ai_executor.shutdown(wait=True, cancel_futures=True)
+    if mcts_agent is not None:
+        mcts_agent.close()
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
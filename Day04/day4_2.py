@@ -1,12 +1,15 @@
-import pygame
 import sys
-import random
+import os
+from mcts import MCTSAgent
+from search_stats import SearchStats, log_move
+from tictactoe_numeric import BOARD_ROWS, BOARD_COLS, reset_board, is_winner, is_board_full, ai_move, random_move
+
+# pygame is only imported by main(); the game logic lives in tictactoe_numeric.py
+pygame = None
 
 # Game constants
 WIDTH, HEIGHT = 300, 350  # Extra space for leaderboard
 LINE_WIDTH = 5
-BOARD_ROWS = 3
-BOARD_COLS = 3
 SQUARE_SIZE = WIDTH // BOARD_COLS
 
 # Colors
@@ -17,16 +20,59 @@ O_COLOR = (239, 231, 200)
 LEADER_COLOR = (0, 0, 0)
 WIN_COLOR = (200, 0, 0)
 
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Random vs Minimax AI (Leaderboard)")
-FONT = pygame.font.SysFont("Arial", 24)
+# AI engine: 'minimax' or 'mcts'
+AI_ENGINE = 'minimax'
+MCTS_TIME_LIMIT = 0.5  # Seconds per MCTS move
+MCTS_WORKERS = os.cpu_count()
+mcts_agent = None  # Created on first use, reuses its tree between moves
+
+# Search instrumentation, off by default
+SHOW_STATS = False  # Show the last AI move's stats under the leaderboard
+STATS_LOG = None  # JSON-lines file with one record per AI move, e.g. 'search_log.jsonl'
+
+LEADER_RECT = (0, 0, WIDTH, 50)
+STATS_RECT = (0, HEIGHT, WIDTH, 16)  # Strip under the board, added to the window with SHOW_STATS
+
+# Set up by setup_display()
+screen = None
+FONT = None
+STATS_FONT = None
+SPRITES = None
+
+def make_sprites():
+    # Pre-rendered X and O, so marking a square is one blit
+    x_sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+    pygame.draw.line(x_sprite, X_COLOR, (20, 20), (SQUARE_SIZE-20, SQUARE_SIZE-20), LINE_WIDTH)
+    pygame.draw.line(x_sprite, X_COLOR, (20, SQUARE_SIZE-20), (SQUARE_SIZE-20, 20), LINE_WIDTH)
+    o_sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+    pygame.draw.circle(o_sprite, O_COLOR, (SQUARE_SIZE//2, SQUARE_SIZE//2), SQUARE_SIZE//2-20, LINE_WIDTH)
+    return {1: x_sprite.convert_alpha(), 2: o_sprite.convert_alpha()}
+
+def setup_display():
+    global pygame, screen, FONT, STATS_FONT, SPRITES
+    import pygame
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT + STATS_RECT[3] if SHOW_STATS else HEIGHT))
+    screen.fill((230,230,230))  # Stats strip background until the first AI move
+    pygame.display.set_caption("Random vs Minimax AI (Leaderboard)")
+    FONT = pygame.font.SysFont("Arial", 24)
+    STATS_FONT = pygame.font.SysFont("Arial", 12)
+    SPRITES = make_sprites()
 
 def draw_leaderboard(ai_wins, rando_wins, draws):
     text = f"AI: {ai_wins}   Rand: {rando_wins}   Draw: {draws}"
     label = FONT.render(text, True, LEADER_COLOR)
-    pygame.draw.rect(screen, (230,230,230), (0, 0, WIDTH, 50)) 
+    pygame.draw.rect(screen, (230,230,230), LEADER_RECT)
     screen.blit(label, (10, 10))
+    return LEADER_RECT
+
+def draw_stats(stats):
+    # One line of search stats in its own strip under the board
+    text = "   ".join(stats.summary_lines()[:2])
+    label = STATS_FONT.render(text, True, LEADER_COLOR)
+    rect = pygame.draw.rect(screen, (230,230,230), STATS_RECT)
+    screen.blit(label, (10, STATS_RECT[1] + 1))
+    return rect
 
 def draw_lines():
     y_offset = 50
@@ -34,97 +80,38 @@ def draw_lines():
         pygame.draw.line(screen, LINE_COLOR, (0, y_offset+SQUARE_SIZE*i), (WIDTH, y_offset+SQUARE_SIZE*i), LINE_WIDTH)
         pygame.draw.line(screen, LINE_COLOR, (SQUARE_SIZE*i, y_offset), (SQUARE_SIZE*i, y_offset+WIDTH), LINE_WIDTH)
 
-def draw_figures(board):
+def draw_square(board, row, col):
+    # Blit one square's mark; squares only ever go from empty to marked
+    # mid-game, so nothing underneath needs clearing. Returns the dirty rect.
     y_offset = 50
+    rect = pygame.Rect(col*SQUARE_SIZE, row*SQUARE_SIZE+y_offset, SQUARE_SIZE, SQUARE_SIZE)
+    sprite = SPRITES.get(board[row][col])
+    if sprite:
+        screen.blit(sprite, rect)
+    return rect
+
+def draw_figures(board):
     for row in range(BOARD_ROWS):
         for col in range(BOARD_COLS):
-            x = col*SQUARE_SIZE
-            y = row*SQUARE_SIZE+y_offset
-            if board[row][col] == 1:
-                # Draw X
-                pygame.draw.line(screen, X_COLOR, (x+20, y+20),
-                                 (x+SQUARE_SIZE-20, y+SQUARE_SIZE-20), LINE_WIDTH)
-                pygame.draw.line(screen, X_COLOR, (x+20, y+SQUARE_SIZE-20),
-                                 (x+SQUARE_SIZE-20, y+20), LINE_WIDTH)
-            elif board[row][col] == 2:
-                # Draw O
-                pygame.draw.circle(screen, O_COLOR,
-                                   (x+SQUARE_SIZE//2, y+SQUARE_SIZE//2),
-                                   SQUARE_SIZE//2-20, LINE_WIDTH)
-
-def is_winner(board, player):
-    # Returns (True, [(row,col), ...]) if player wins, else (False, [])
-    for i in range(3):
-        # Rows
-        if all([board[i][j]==player for j in range(3)]):
-            return True, [(i,0),(i,1),(i,2)]
-        # Columns
-        if all([board[j][i]==player for j in range(3)]):
-            return True, [(0,i),(1,i),(2,i)]
-    # Diagonals
-    if all([board[i][i]==player for i in range(3)]):
-        return True, [(0,0),(1,1),(2,2)]
-    if all([board[i][2-i]==player for i in range(3)]):
-        return True, [(0,2),(1,1),(2,0)]
-    return False, []
-
-def is_board_full(board):
-    return all([board[row][col] != 0 for row in range(3) for col in range(3)])
-
-def minimax(b, depth, is_maximizing):
-    ai_win, _ = is_winner(b, 2)
-    rando_win, _ = is_winner(b, 1)
-    if ai_win:
-        return 1
-    if rando_win:
-        return -1
-    if is_board_full(b):
-        return 0
-
-    if is_maximizing:
-        best_score = -float('inf')
-        for row in range(3):
-            for col in range(3):
-                if b[row][col] == 0:
-                    b[row][col] = 2
-                    score = minimax(b, depth+1, False)
-                    b[row][col] = 0
-                    best_score = max(score, best_score)
-        return best_score
-    else:
-        best_score = float('inf')
-        for row in range(3):
-            for col in range(3):
-                if b[row][col] == 0:
-                    b[row][col] = 1
-                    score = minimax(b, depth+1, True)
-                    b[row][col] = 0
-                    best_score = min(score, best_score)
-        return best_score
-
-def ai_move(board):
-    best_score = -float('inf')
-    move = None
-    for row in range(3):
-        for col in range(3):
-            if board[row][col] == 0:
-                board[row][col] = 2
-                score = minimax(board, 0, False)
-                board[row][col] = 0
-                if score > best_score:
-                    best_score = score
-                    move = (row, col)
-    if move:
-        board[move[0]][move[1]] = 2
-
-def random_move(board):
-    empty = [(r,c) for r in range(3) for c in range(3) if board[r][c]==0]
-    if empty:
-        move = random.choice(empty)
-        board[move[0]][move[1]] = 1
-
-def reset_board():
-    return [[0 for _ in range(BOARD_COLS)] for _ in range(BOARD_ROWS)]
+            draw_square(board, row, col)
+
+def draw_all(board, ai_wins, rando_wins, draws):
+    # Full repaint, only needed for a fresh board or an exposed window.
+    # The stats strip is left alone, so the last move's stats stay up.
+    screen.fill(BG_COLOR, (0, 0, WIDTH, HEIGHT))
+    draw_leaderboard(ai_wins, rando_wins, draws)
+    draw_lines()
+    draw_figures(board)
+    return screen.get_rect()
+
+def get_mcts_agent():
+    # The MCTS agent for AI_ENGINE == 'mcts', else None (plain minimax)
+    global mcts_agent
+    if AI_ENGINE != 'mcts':
+        return None
+    if mcts_agent is None:
+        mcts_agent = MCTSAgent(BOARD_ROWS, BOARD_COLS, 3, time_limit=MCTS_TIME_LIMIT, workers=MCTS_WORKERS)
+    return mcts_agent
 
 def draw_win_line(winning_cells):
     y_offset = 50
@@ -132,77 +119,85 @@ def draw_win_line(winning_cells):
     y0 = winning_cells[0][0]*SQUARE_SIZE + SQUARE_SIZE//2 + y_offset
     x1 = winning_cells[2][1]*SQUARE_SIZE + SQUARE_SIZE//2
     y1 = winning_cells[2][0]*SQUARE_SIZE + SQUARE_SIZE//2 + y_offset
-    pygame.draw.line(screen, WIN_COLOR, (x0, y0), (x1, y1), LINE_WIDTH*2)
-
-# Leaderboard counts
-ai_wins = 0
-rando_wins = 0
-draws = 0
-
-# Main loop
-running = True
-player_turn = True  # Rando starts for fairness!
-
-board = reset_board()
-
-screen.fill(BG_COLOR)
-draw_leaderboard(ai_wins, rando_wins, draws)
-draw_lines()
-draw_figures(board)
-pygame.display.update()
-CLOCK = pygame.time.Clock()
-
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-
-    if player_turn and not is_winner(board, 1)[0] and not is_winner(board, 2)[0] and not is_board_full(board):
-        random_move(board)
-        player_turn = False
-
-    elif not player_turn and not is_winner(board, 1)[0] and not is_winner(board, 2)[0] and not is_board_full(board):
-        ai_move(board)
-        player_turn = True
-
-    # Draw everything (after move)
-    screen.fill(BG_COLOR)
-    draw_leaderboard(ai_wins, rando_wins, draws)
-    draw_lines()
-    draw_figures(board)
-    pygame.display.update()
-
-    # Check for game end
-    rando_won, winning_cells_rando = is_winner(board, 1)
-    ai_won, winning_cells_ai = is_winner(board, 2)
-    if rando_won:
-        screen.fill(BG_COLOR)
-        draw_leaderboard(ai_wins, rando_wins, draws)
-        draw_lines()
-        draw_figures(board)
-        draw_win_line(winning_cells_rando)
-        pygame.display.update()
-        pygame.time.wait(1000)
-        rando_wins += 1
-        board = reset_board()
-        player_turn = True  # rando starts
-    elif ai_won:
-        screen.fill(BG_COLOR)
-        draw_leaderboard(ai_wins, rando_wins, draws)
-        draw_lines()
-        draw_figures(board)
-        draw_win_line(winning_cells_ai)
-        pygame.display.update()
-        pygame.time.wait(1000)
-        ai_wins += 1
-        board = reset_board()
-        player_turn = True
-    elif is_board_full(board):
-        pygame.display.update()
-        pygame.time.wait(800)
-        draws += 1
-        board = reset_board()
-        player_turn = True
-
-    CLOCK.tick(120)  # Fast but see the effect!
\ No newline at end of file
+    return pygame.draw.line(screen, WIN_COLOR, (x0, y0), (x1, y1), LINE_WIDTH*2)
+
+def main():
+    setup_display()
+
+    # Leaderboard counts
+    ai_wins = 0
+    rando_wins = 0
+    draws = 0
+
+    running = True
+    player_turn = True  # Rando starts for fairness!
+
+    board = reset_board()
+
+    pygame.display.update(draw_all(board, ai_wins, rando_wins, draws))
+    CLOCK = pygame.time.Clock()
+
+    while running:
+        dirty_rects = []  # Only these parts of the window get pushed this frame
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                if mcts_agent is not None:
+                    mcts_agent.close()
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.WINDOWEXPOSED:
+                dirty_rects.append(draw_all(board, ai_wins, rando_wins, draws))
+
+        move = None
+        if player_turn and not is_winner(board, 1)[0] and not is_winner(board, 2)[0] and not is_board_full(board):
+            move = random_move(board)
+            player_turn = False
+
+        elif not player_turn and not is_winner(board, 1)[0] and not is_winner(board, 2)[0] and not is_board_full(board):
+            stats = SearchStats(AI_ENGINE) if SHOW_STATS or STATS_LOG else None
+            if STATS_LOG:
+                searched = [row[:] for row in board]  # Position before the AI's move
+            move = ai_move(board, stats, get_mcts_agent())
+            if stats is not None:
+                stats.stop()
+                if STATS_LOG:
+                    log_move(STATS_LOG, stats, board=searched, move=move)
+                if SHOW_STATS:
+                    dirty_rects.append(draw_stats(stats))
+            player_turn = True
+
+        # Draw just the square that changed
+        if move:
+            dirty_rects.append(draw_square(board, move[0], move[1]))
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+
+        # Check for game end
+        rando_won, winning_cells_rando = is_winner(board, 1)
+        ai_won, winning_cells_ai = is_winner(board, 2)
+        if rando_won:
+            pygame.display.update(draw_win_line(winning_cells_rando))
+            pygame.time.wait(1000)
+            rando_wins += 1
+            board = reset_board()
+            player_turn = True  # rando starts
+            pygame.display.update(draw_all(board, ai_wins, rando_wins, draws))
+        elif ai_won:
+            pygame.display.update(draw_win_line(winning_cells_ai))
+            pygame.time.wait(1000)
+            ai_wins += 1
+            board = reset_board()
+            player_turn = True
+            pygame.display.update(draw_all(board, ai_wins, rando_wins, draws))
+        elif is_board_full(board):
+            pygame.time.wait(800)
+            draws += 1
+            board = reset_board()
+            player_turn = True
+            pygame.display.update(draw_all(board, ai_wins, rando_wins, draws))
+
+        CLOCK.tick(120)  # Fast but see the effect!
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from server import HOST, PORT
+
+# Load generator for server.py: `clients` connections each play `games` games
+# with random X moves, then it reports moves per second and move latency.
+#
+#   python load_client.py --clients 1000 --games 5
+
+async def request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+    return response
+
+async def play(host, port, games, rng, latencies):
+    """One client: plays `games` games in a row, recording each move's round trip."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games):
+            state = await request(reader, writer, {'op': 'new'})
+            while not state['over']:
+                empty = [(r, c) for r, row in enumerate(state['board']) for c, value in enumerate(row) if not value]
+                row, col = rng.choice(empty)
+                start = time.perf_counter()
+                state = await request(reader, writer, {'op': 'move', 'game': state['game'], 'row': row, 'col': col})
+                latencies.append(time.perf_counter() - start)
+            await request(reader, writer, {'op': 'close', 'game': state['game']})
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+async def run(host, port, clients, games, seed):
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(play(host, port, games, random.Random(rng.getrandbits(64)), latencies)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    stats = await request(reader, writer, {'op': 'stats'})
+    writer.close()
+    await writer.wait_closed()
+
+    latencies.sort()
+    print(f"{clients} clients x {games} games: {len(latencies)} moves in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} moves/s)")
+    print(f"latency p50 {percentile(latencies, 0.50) * 1000:.2f} ms   "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms   max {latencies[-1] * 1000:.2f} ms")
+    lookups = stats['cache_hits'] + stats['cache_misses']
+    print(f"server: {stats['searches']} searches, {stats['shared_waits']} shared waits, "
+          f"cache {stats['cache_size']} positions, "
+          f"hit rate {stats['cache_hits'] / lookups * 100 if lookups else 0:.1f}%")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for the tic-tac-toe server.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--clients', type=int, default=1000, help="concurrent connections (one game at a time each)")
+    parser.add_argument('--games', type=int, default=5, help="games per client")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.host, args.port, args.clients, args.games, args.seed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from search_stats import SearchStats
+
+# Cell values: the board is a list of rows holding EMPTY, 1 or 2
+EMPTY = 0
+DRAW = 0 # Game result when nobody completes a line
+
+# --- Constants ---
+EXPLORATION = math.sqrt(2) # UCT exploration constant (c)
+# Pool processes are always spawned, never forked: the games start the pool from
+# a worker thread of a process running SDL, which fork would copy half-initialised.
+# Spawned workers re-import the main script, so scripts using workers > 1 must
+# keep their game loop behind `if __name__ == "__main__":` (day4_1.py, day4_2.py do).
+POOL_CONTEXT = multiprocessing.get_context('spawn')
+CANCEL_POLL = 0.02 # Seconds between checks of the caller's cancel event during a parallel search
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)] # Right, down, and the two diagonals
+
+def other(player):
+    """Returns the opponent of player (1 <-> 2)."""
+    return 3 - player
+
+def completes_line(cells, rows, cols, k, index, player):
+    """Checks if player's stone at index makes k in a row (only lines through index)."""
+    r, c = divmod(index, cols)
+    for dr, dc in DIRECTIONS:
+        count = 1
+        for sign in (1, -1): # Walk both ways from the new stone
+            nr, nc = r + dr * sign, c + dc * sign
+            while 0 <= nr < rows and 0 <= nc < cols and cells[nr * cols + nc] == player:
+                count += 1
+                nr += dr * sign
+                nc += dc * sign
+        if count >= k:
+            return True
+    return False
+
+class Node:
+    """One position in the search tree, reached by `player` playing `move`."""
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'result', 'wins', 'visits')
+
+    def __init__(self, move, player, parent, untried, result):
+        self.move = move # Flat cell index played to reach this node (None for the root)
+        self.player = player # Player who just moved
+        self.parent = parent
+        self.children = []
+        self.untried = untried # Moves not expanded yet
+        self.result = result # Winner, DRAW, or None while the game goes on
+        self.wins = 0.0 # Score from `player`'s point of view (draw = 0.5)
+        self.visits = 0
+
+    def select_child(self, exploration):
+        """Picks the child with the best UCT score."""
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+def new_root(cells, player):
+    """Creates a root for a position where `player` is about to move."""
+    untried = [i for i, value in enumerate(cells) if value == EMPTY]
+    return Node(None, other(player), None, untried, None if untried else DRAW)
+
+def run_iterations(root, cells, rows, cols, k, exploration, rng, iterations=None, time_limit=None,
+                   cancel=None, stats=None):
+    """
+    Runs UCT iterations on root (the position `cells`) until the iteration or
+    time budget is used up, or cancel (a threading.Event) is set.
+    stats: optional SearchStats; counts new tree nodes, tree depth and iterations.
+    Returns the number of iterations done.
+    """
+    if stats is not None:
+        stats.cache_hits += root.visits # Playouts inherited from the reused tree
+        if root.visits == 0:
+            stats.visit(0)
+            stats.expand(len(root.untried))
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    done = 0
+    while iterations is None or done < iterations:
+        if done % 16 == 0: # Clock and cancel checks cost more than a small playout
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if cancel is not None and cancel.is_set():
+                break
+
+        state = cells[:]
+        node = root
+        depth = 0
+
+        # 1. Selection: walk down fully expanded nodes
+        while not node.untried and node.children and node.result is None:
+            node = node.select_child(exploration)
+            state[node.move] = node.player
+            depth += 1
+
+        # 2. Expansion: add one unexplored move
+        if node.result is None and node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            player = other(node.player)
+            state[move] = player
+            if completes_line(state, rows, cols, k, move, player):
+                child = Node(move, player, node, [], player)
+            else:
+                untried = [i for i, value in enumerate(state) if value == EMPTY]
+                child = Node(move, player, node, untried, None if untried else DRAW)
+            node.children.append(child)
+            node = child
+            if stats is not None:
+                stats.visit(depth + 1)
+                if child.untried:
+                    stats.expand(len(child.untried))
+
+        # 3. Simulation: random playout to the end of the game
+        result = node.result
+        if result is None:
+            empties = [i for i, value in enumerate(state) if value == EMPTY]
+            rng.shuffle(empties)
+            player = node.player
+            result = DRAW
+            for move in empties:
+                player = other(player)
+                state[move] = player
+                if completes_line(state, rows, cols, k, move, player):
+                    result = player
+                    break
+
+        # 4. Backpropagation
+        while node is not None:
+            node.visits += 1
+            if result == node.player:
+                node.wins += 1
+            elif result == DRAW:
+                node.wins += 0.5
+            node = node.parent
+        done += 1
+    if stats is not None:
+        stats.iterations += done
+    return done
+
+def descend(root, root_cells, cells):
+    """
+    Finds the node for position `cells` below root (position root_cells) so the
+    subtree can be reused. Returns None when cells is not a later position.
+    """
+    new_moves = {}
+    for i, (old, new) in enumerate(zip(root_cells, cells)):
+        if old != new:
+            if old != EMPTY:
+                return None # A stone changed or disappeared: different game
+            new_moves[i] = new
+
+    node = root
+    while new_moves:
+        player = other(node.player)
+        # The next move on the path is the one stone `player` added
+        candidates = [i for i, p in new_moves.items() if p == player]
+        if len(candidates) != 1:
+            return None
+        move = candidates[0]
+        node = next((child for child in node.children if child.move == move), None)
+        if node is None:
+            return None
+        del new_moves[move]
+    return node
+
+def child_stats(root):
+    """Returns {move: (visits, wins)} for the root's children."""
+    return {child.move: (child.visits, child.wins) for child in root.children}
+
+# --- Process pool worker ---
+# Each worker process keeps one tree: the one its last search built. The pool
+# gives no control over which process runs which task, so the tree belongs to
+# the process (not to a task slot) and any search it runs next continues it.
+_worker_id = None # Assigned once per process by _init_worker
+_worker_tree = None # (root, cells) of this process's last search
+_worker_cancel = None # multiprocessing.Event shared with the agent; set to stop every worker's search
+
+def _init_worker(next_id, cancel):
+    global _worker_id, _worker_cancel
+    with next_id.get_lock():
+        _worker_id = next_id.value
+        next_id.value += 1
+    _worker_cancel = cancel
+
+def _search_worker(cells, player, rows, cols, k, exploration, iterations, time_limit, seed, collect_stats):
+    """
+    Runs one root-parallel search inside a pool worker, continuing its tree.
+    Returns (worker id, root child stats, iterations, SearchStats or None).
+    """
+    global _worker_tree
+    rng = random.Random(seed)
+    root = None
+    if _worker_tree is not None:
+        root = descend(_worker_tree[0], _worker_tree[1], cells)
+    if root is None:
+        root = new_root(cells, player)
+    root.parent = None # Detach so the old tree above can be freed
+    _worker_tree = (root, cells)
+    stats = SearchStats('mcts') if collect_stats else None
+    done = run_iterations(root, cells, rows, cols, k, exploration, rng, iterations, time_limit,
+                          _worker_cancel, stats)
+    return _worker_id, child_stats(root), done, stats
+
+class MCTSAgent:
+    """
+    Monte Carlo Tree Search (UCT) player for k-in-a-row on a rows x cols board.
+    - iterations / time_limit: search budget per move (whichever runs out first).
+    - workers: >1 runs that many independent searches in a process pool
+      (root parallelization) and sums their root statistics.
+    The tree is kept between moves and reused when the next position is a
+    continuation of the last one. After each move `last_stats` holds
+    iterations, elapsed seconds and iterations per second.
+    """
+
+    def __init__(self, rows=3, cols=3, k=3, iterations=None, time_limit=1.0,
+                 workers=1, exploration=EXPLORATION, seed=None):
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTSAgent needs an iteration or time budget")
+        self.rows, self.cols, self.k = rows, cols, k
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers if workers else os.cpu_count()
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.pool = None # Created on first parallel search
+        self.pool_cancel = None # Its workers' shared cancel event
+        self.root = None # Tree from the previous move (single-process search)
+        self.root_cells = None
+        self.last_stats = None
+
+    def choose_move(self, board, player, cancel=None, stats=None):
+        """
+        Returns the (row, col) MCTS picks for player on board (rows of 0/1/2).
+        cancel (a threading.Event) stops the search early, in-process or in the pool.
+        stats (a SearchStats) collects node counts, including from pool workers.
+        """
+        cells = [value for row in board for value in row]
+        if EMPTY not in cells:
+            return None
+
+        start = time.perf_counter()
+        if self.workers > 1:
+            visits, done = self._search_parallel(cells, player, cancel, stats)
+        else:
+            visits, done = self._search_local(cells, player, cancel, stats)
+        elapsed = time.perf_counter() - start
+
+        self.last_stats = {
+            'iterations': done,
+            'elapsed': elapsed,
+            'iterations_per_second': done / elapsed if elapsed > 0 else 0.0,
+            'workers': self.workers,
+        }
+        if not visits: # Budget too small to expand anything: fall back to a random move
+            move = self.rng.choice([i for i, value in enumerate(cells) if value == EMPTY])
+        else:
+            move = max(visits, key=lambda m: visits[m][0]) # Most visited = most robust
+        return divmod(move, self.cols)
+
+    def _search_local(self, cells, player, cancel, stats):
+        root = None
+        if self.root is not None:
+            root = descend(self.root, self.root_cells, cells)
+        if root is None:
+            root = new_root(cells, player)
+        root.parent = None
+        self.root, self.root_cells = root, cells
+        done = run_iterations(root, cells, self.rows, self.cols, self.k, self.exploration,
+                              self.rng, self.iterations, self.time_limit, cancel, stats)
+        return child_stats(root), done
+
+    def _search_parallel(self, cells, player, cancel, stats):
+        if self.pool is None:
+            self.pool_cancel = POOL_CONTEXT.Event()
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=POOL_CONTEXT,
+                                            initializer=_init_worker,
+                                            initargs=(POOL_CONTEXT.Value('i', 0), self.pool_cancel))
+        self.pool_cancel.clear()
+        iterations = -(-self.iterations // self.workers) if self.iterations is not None else None
+        futures = [self.pool.submit(_search_worker, cells, player, self.rows, self.cols, self.k,
+                                    self.exploration, iterations, self.time_limit,
+                                    self.rng.getrandbits(64), stats is not None)
+                   for _ in range(self.workers)]
+        # A threading.Event can't reach other processes: watch it here and
+        # forward it to the workers, which stop within a few playouts
+        pending = futures
+        while pending:
+            if cancel is not None and cancel.is_set():
+                self.pool_cancel.set()
+            pending = wait(pending, timeout=CANCEL_POLL)[1]
+        latest, done = {}, 0 # worker id -> root child stats of its tree
+        for future in futures:
+            worker, worker_totals, worker_done, worker_stats = future.result()
+            done += worker_done
+            if worker_stats is not None:
+                stats.merge(worker_stats)
+            # A process that ran two of the searches grew one tree twice: its
+            # later (bigger) result already includes the earlier one
+            previous = latest.get(worker)
+            if previous is None or sum(v for v, _ in worker_totals.values()) > sum(v for v, _ in previous.values()):
+                latest[worker] = worker_totals
+        totals = {}
+        for worker_totals in latest.values():
+            for move, (visits, wins) in worker_totals.items():
+                total_visits, total_wins = totals.get(move, (0, 0.0))
+                totals[move] = (total_visits + visits, total_wins + wins)
+        return totals, done
+
+    def close(self):
+        """Shuts down the worker pool (if one was started)."""
+        if self.pool is not None:
+            self.pool_cancel.set() # Running searches stop instead of using up their budget
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
@@ -0,0 +1,90 @@
+import json
+import time
+from collections import Counter
+
+class SearchStats:
+    """
+    Work counters for one AI move. Engines take an optional `stats` argument
+    and only touch it when one is passed, so leaving it out costs a single
+    `is not None` check per node.
+    - nodes: positions the search visited (minimax) or tree nodes it added (MCTS)
+    - max_depth: deepest ply reached below the root
+    - cutoffs / cache_hits: pruned branches and reused results, where the engine has them
+    - iterations: MCTS playouts (0 for minimax)
+    - branching: histogram {legal moves: how many expanded nodes had that many}
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.nodes = 0
+        self.max_depth = 0
+        self.cutoffs = 0
+        self.cache_hits = 0
+        self.iterations = 0
+        self.branching = Counter()
+        self.started = time.perf_counter()
+        self.elapsed = None
+
+    def visit(self, depth):
+        """Records one node at `depth` plies below the root."""
+        self.nodes += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def expand(self, moves):
+        """Records a non-terminal node that had `moves` legal moves."""
+        self.branching[moves] += 1
+
+    def merge(self, other):
+        """Adds another search's counters (e.g. from a pool worker) to these."""
+        self.nodes += other.nodes
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.cutoffs += other.cutoffs
+        self.cache_hits += other.cache_hits
+        self.iterations += other.iterations
+        self.branching.update(other.branching)
+
+    def stop(self):
+        """Freezes the time per move; call when the engine returns its move."""
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def mean_branching(self):
+        expanded = sum(self.branching.values())
+        if not expanded:
+            return 0.0
+        return sum(moves * count for moves, count in self.branching.items()) / expanded
+
+    def as_dict(self):
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self.started
+        return {
+            'engine': self.engine,
+            'nodes': self.nodes,
+            'max_depth': self.max_depth,
+            'cutoffs': self.cutoffs,
+            'cache_hits': self.cache_hits,
+            'iterations': self.iterations,
+            'elapsed': elapsed,
+            'nodes_per_second': self.nodes / elapsed if elapsed > 0 else 0.0,
+            'mean_branching': self.mean_branching(),
+            'branching': {str(moves): count for moves, count in sorted(self.branching.items())},
+        }
+
+    def summary_lines(self):
+        """Short text lines for an on-screen overlay."""
+        d = self.as_dict()
+        lines = [f"{d['engine']}: {d['nodes']} nodes in {d['elapsed']:.2f}s",
+                 f"{d['nodes_per_second']:.0f} n/s  depth {d['max_depth']}  b {d['mean_branching']:.1f}"]
+        if self.iterations:
+            lines.append(f"{self.iterations} iters ({self.iterations / d['elapsed']:.0f}/s)"
+                         if d['elapsed'] > 0 else f"{self.iterations} iters")
+        if self.cutoffs or self.cache_hits:
+            lines.append(f"cutoffs {self.cutoffs}  cache hits {self.cache_hits}")
+        return lines
+
+def log_move(path, stats, **fields):
+    """Appends one JSON line for a move: the stats plus any extra fields (board, move, ...)."""
+    record = dict(fields)
+    record.update(stats.as_dict())
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
@@ -0,0 +1,205 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from tictactoe import (BOARD_ROWS, BOARD_COLS, PLAYER_X, PLAYER_O, new_board, mark_square,
+                       is_board_full, check_winner, find_best_move)
+
+# Local asyncio server hosting many tic-tac-toe games against the minimax AI.
+# Protocol: one JSON object per line over TCP, one response line per request.
+#   {"op": "new"}                               -> game state
+#   {"op": "move", "game": 1, "row": 0, "col": 2} -> game state after your X and the AI's O
+#   {"op": "close", "game": 1}                  -> {"closed": 1}
+#   {"op": "stats"}                             -> games, cache hits/misses, searches, shared waits
+# Errors come back as {"error": "..."}. Games die with the connection that made them.
+# A request line longer than the stream limit (64 KiB) gets an error and the connection is closed.
+#
+#   python server.py --port 8765 --workers 4
+#   python load_client.py --port 8765 --clients 1000
+
+# --- Settings ---
+HOST = '127.0.0.1'
+PORT = 8765
+CACHE_SIZE = 100_000 # Positions kept in the shared AI cache (3x3 has < 6000 reachable)
+BACKLOG = 4096 # Pending connections; load tests open thousands at once
+
+# --- Search (runs in the process pool) ---
+
+def position_key(board):
+    """Board as a 'X.O......' string: hashable, compact and cheap to send to a worker."""
+    return ''.join(value or '.' for row in board for value in row)
+
+def search_position(key):
+    """Minimax best move for O in the position `key`; runs in a pool worker."""
+    cells = ['' if value == '.' else value for value in key]
+    board = [cells[r * BOARD_COLS:(r + 1) * BOARD_COLS] for r in range(BOARD_ROWS)]
+    return find_best_move(board)
+
+# --- Game State ---
+
+class Game:
+    """One game against the AI: the client plays X and moves first, the AI is O."""
+
+    def __init__(self, game_id):
+        self.id = game_id
+        self.board = new_board()
+        self.winner = None
+        self.over = False
+
+    def play(self, row, col, symbol):
+        """Marks (row, col) for symbol and updates winner/over. Raises ValueError on a bad move."""
+        if self.over:
+            raise ValueError("game is over")
+        if not (0 <= row < BOARD_ROWS and 0 <= col < BOARD_COLS):
+            raise ValueError("square out of range")
+        if not mark_square(self.board, row, col, symbol):
+            raise ValueError("square is taken")
+        self.winner = check_winner(self.board)
+        self.over = bool(self.winner) or is_board_full(self.board)
+
+    def state(self):
+        return {'game': self.id, 'board': self.board, 'winner': self.winner, 'over': self.over}
+
+class PositionCache:
+    """LRU map from position_key to the AI's best move, shared by every game."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.moves = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        move = self.moves.get(key)
+        if move is None:
+            self.misses += 1
+            return None
+        self.moves.move_to_end(key)
+        self.hits += 1
+        return move
+
+    def put(self, key, move):
+        self.moves[key] = move
+        self.moves.move_to_end(key)
+        if len(self.moves) > self.max_size:
+            self.moves.popitem(last=False)
+
+# --- Server ---
+
+class GameServer:
+    def __init__(self, executor, cache_size=CACHE_SIZE):
+        self.executor = executor
+        self.games = {}
+        self.game_ids = itertools.count(1)
+        self.cache = PositionCache(cache_size)
+        self.pending = {} # position_key -> Task, so one search serves every game waiting on it
+        self.searches = 0
+        self.shared_waits = 0 # Lookups answered by joining a search already in flight
+
+    async def best_move(self, board):
+        """AI move for board: from the cache, else from a (shared) search in the pool."""
+        key = position_key(board)
+        task = self.pending.get(key)
+        if task is not None:
+            # Checked before the cache, so a wait on a search in flight is not a cache miss
+            self.shared_waits += 1
+        else:
+            move = self.cache.get(key)
+            if move is not None:
+                return move
+            task = asyncio.ensure_future(self._search(key))
+            self.pending[key] = task
+        # shield: a client disconnecting must not cancel a search other games wait on
+        return await asyncio.shield(task)
+
+    async def _search(self, key):
+        try:
+            self.searches += 1
+            loop = asyncio.get_running_loop()
+            move = tuple(await loop.run_in_executor(self.executor, search_position, key))
+            self.cache.put(key, move)
+            return move
+        finally:
+            del self.pending[key]
+
+    async def dispatch(self, request, owned):
+        op = request['op']
+        if op == 'new':
+            game = Game(next(self.game_ids))
+            self.games[game.id] = game
+            owned.add(game.id)
+            return game.state()
+        if op == 'move':
+            game = self.games.get(request['game'])
+            if game is None or game.id not in owned:
+                raise ValueError("unknown game")
+            game.play(int(request['row']), int(request['col']), PLAYER_X)
+            response = game.state()
+            if not game.over:
+                row, col = await self.best_move(game.board)
+                game.play(row, col, PLAYER_O)
+                response = game.state()
+                response['ai_move'] = [row, col]
+            return response
+        if op == 'close':
+            game_id = request['game']
+            if game_id in owned:
+                owned.discard(game_id)
+                self.games.pop(game_id, None)
+            return {'closed': game_id}
+        if op == 'stats':
+            return {'games': len(self.games), 'searches': self.searches, 'shared_waits': self.shared_waits,
+                    'cache_size': len(self.cache.moves),
+                    'cache_hits': self.cache.hits, 'cache_misses': self.cache.misses}
+        raise ValueError(f"unknown op {op!r}")
+
+    async def handle_client(self, reader, writer):
+        owned = set() # Games created on this connection
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError: # Over the stream limit (LimitOverrunError is wrapped in it)
+                    writer.write(json.dumps({'error': "request line too long"}).encode() + b'\n')
+                    await writer.drain()
+                    break # The rest of the line is still coming, so the framing is lost
+                if not line:
+                    break
+                try:
+                    response = await self.dispatch(json.loads(line), owned)
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {'error': str(e)}
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game_id in owned:
+                self.games.pop(game_id, None)
+            writer.close()
+
+async def serve(host, port, workers):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        game_server = GameServer(executor)
+        server = await asyncio.start_server(game_server.handle_client, host, port, backlog=BACKLOG)
+        print(f"Serving tic-tac-toe on {host}:{port} with {workers} search workers")
+        async with server:
+            await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asyncio tic-tac-toe server with a shared AI cache.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="search processes")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# Pygame-free tic-tac-toe core: board rules and the AI search engines.
+# Importing this module has no side effects, so batch jobs, benchmarks and
+# pool workers can use it without opening a window (the UI lives in day4_1.py).
+
+# --- Constants ---
+BOARD_ROWS = 3
+BOARD_COLS = 3
+WIN_LENGTH = 3 # Marks in a row needed to win (k)
+
+# Player representation
+PLAYER_X = 'X'
+PLAYER_O = 'O' # AI is 'O'
+
+# Every run of WIN_LENGTH squares (rows, columns, both diagonals) as (row, col) tuples
+WIN_LINES = [[(r + i * dr, c + i * dc) for i in range(WIN_LENGTH)]
+             for r in range(BOARD_ROWS) for c in range(BOARD_COLS)
+             for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1))
+             if 0 <= r + (WIN_LENGTH - 1) * dr < BOARD_ROWS and 0 <= c + (WIN_LENGTH - 1) * dc < BOARD_COLS]
+
+# --- Board Logic ---
+
+def new_board():
+    """Returns an empty BOARD_ROWS x BOARD_COLS board."""
+    return [['' for _ in range(BOARD_COLS)] for _ in range(BOARD_ROWS)]
+
+def mark_square(board, row, col, player_symbol):
+    """Marks a square on the board if it's available."""
+    if board[row][col] == '':
+        board[row][col] = player_symbol
+        return True
+    return False
+
+def available_squares(board):
+    """Returns a list of tuples (row, col) for all empty squares."""
+    return [(r, c) for r in range(BOARD_ROWS) for c in range(BOARD_COLS) if board[r][c] == '']
+
+def is_board_full(board):
+    """Checks if the board has any empty squares left."""
+    return len(available_squares(board)) == 0
+
+def check_winner(board):
+    """
+    Checks if there is a winner on the given board.
+    Returns the winning player's symbol ('X' or 'O') or None.
+    """
+    # Check every row, column and diagonal run of WIN_LENGTH squares
+    for line in WIN_LINES:
+        r, c = line[0]
+        first = board[r][c]
+        if first == '':
+            continue
+        for r2, c2 in line[1:]:
+            if board[r2][c2] != first:
+                break
+        else: # Every square in the line matched
+            return first
+
+    return None # No winner
+
+# --- AI Logic (Minimax) ---
+
+class SearchCancelled(Exception):
+    """Raised inside the search when the game is reset while the AI is thinking."""
+
+def evaluate_board(board):
+    """Evaluates the board state for the minimax algorithm."""
+    winner = check_winner(board)
+    if winner == PLAYER_O:
+        return 1  # AI wins
+    elif winner == PLAYER_X:
+        return -1 # Player wins
+    elif is_board_full(board):
+        return 0  # Draw
+    else:
+        return None # Game not finished
+
+def minimax(current_board, depth, is_maximizing, cancel=None, stats=None):
+    """
+    Minimax algorithm implementation.
+    - is_maximizing: True if it's AI's turn (O), False if Player's turn (X).
+    - cancel: optional threading.Event; the search stops with SearchCancelled once it is set.
+    - stats: optional SearchStats that counts the nodes visited.
+    - Returns the best score achievable from the current state.
+    """
+    if cancel is not None and cancel.is_set():
+        raise SearchCancelled()
+    if stats is not None:
+        stats.visit(depth + 1) # depth 0 is already one move below the root
+
+    score = evaluate_board(current_board)
+    if score is not None: # Base case: Game over or draw
+        return score
+
+    moves = available_squares(current_board)
+    if stats is not None:
+        stats.expand(len(moves))
+
+    if is_maximizing: # AI's turn (O) - maximize the score
+        best_score = -float('inf')
+        for r, c in moves:
+            current_board[r][c] = PLAYER_O
+            current_score = minimax(current_board, depth + 1, False, cancel, stats) # Switch to minimizing
+            current_board[r][c] = '' # Undo the move
+            best_score = max(best_score, current_score)
+        return best_score
+    else: # Player's turn (X) - minimize the score
+        best_score = float('inf')
+        for r, c in moves:
+            current_board[r][c] = PLAYER_X
+            current_score = minimax(current_board, depth + 1, True, cancel, stats) # Switch to maximizing
+            current_board[r][c] = '' # Undo the move
+            best_score = min(best_score, current_score)
+        return best_score
+
+def find_best_move(board, cancel=None, stats=None):
+    """
+    Finds the best move for the AI (Player O) using the minimax algorithm.
+    Searches board in place, undoing every trial move.
+    stats: optional SearchStats to fill in for this move.
+    Returns the best (row, col) tuple for the AI to move to.
+    """
+    best_score = -float('inf')
+    best_move = None
+    moves = available_squares(board)
+
+    if not moves: # Should not happen if called correctly, but safety check
+        return None
+
+    if stats is not None:
+        stats.visit(0) # The root position
+        stats.expand(len(moves))
+
+    for r, c in moves:
+        board[r][c] = PLAYER_O # Try the move
+        score = minimax(board, 0, False, cancel, stats) # Evaluate starting from opponent's perspective
+        board[r][c] = '' # Undo the move
+
+        if score > best_score:
+            best_score = score
+            best_move = (r, c)
+
+    if stats is not None:
+        stats.stop()
+    return best_move
+
+# --- AI Logic (MCTS) ---
+
+def find_best_move_mcts(board, agent, cancel=None, stats=None):
+    """
+    Finds the AI's move with an MCTSAgent (see mcts.py) built for this board size.
+    stats: optional SearchStats to fill in for this move.
+    Returns the best (row, col) tuple for the AI to move to.
+    """
+    cells = [[{PLAYER_X: 1, PLAYER_O: 2}.get(value, 0) for value in row] for row in board]
+    move = agent.choose_move(cells, 2, cancel, stats)
+    if stats is not None:
+        stats.stop()
+    return move
@@ -0,0 +1,106 @@
+# Pygame-free rules and engines for the 0/1/2 board used by day4_2.py:
+# 0 is an empty square, 1 is Rando (random mover) and 2 is the AI.
+# Like tictactoe.py, importing this module has no side effects, so the
+# benchmark can play these engines without loading the game script.
+import random
+
+# --- Constants ---
+BOARD_ROWS = 3
+BOARD_COLS = 3
+
+# --- Board Logic ---
+
+def reset_board():
+    return [[0 for _ in range(BOARD_COLS)] for _ in range(BOARD_ROWS)]
+
+def is_winner(board, player):
+    # Returns (True, [(row,col), ...]) if player wins, else (False, [])
+    for i in range(3):
+        # Rows
+        if all([board[i][j]==player for j in range(3)]):
+            return True, [(i,0),(i,1),(i,2)]
+        # Columns
+        if all([board[j][i]==player for j in range(3)]):
+            return True, [(0,i),(1,i),(2,i)]
+    # Diagonals
+    if all([board[i][i]==player for i in range(3)]):
+        return True, [(0,0),(1,1),(2,2)]
+    if all([board[i][2-i]==player for i in range(3)]):
+        return True, [(0,2),(1,1),(2,0)]
+    return False, []
+
+def is_board_full(board):
+    return all([board[row][col] != 0 for row in range(3) for col in range(3)])
+
+# --- Engines ---
+
+def minimax(b, depth, is_maximizing, stats=None):
+    if stats is not None:
+        stats.visit(depth+1)
+    ai_win, _ = is_winner(b, 2)
+    rando_win, _ = is_winner(b, 1)
+    if ai_win:
+        return 1
+    if rando_win:
+        return -1
+    if is_board_full(b):
+        return 0
+    if stats is not None:
+        stats.expand(sum(value == 0 for row in b for value in row))
+
+    if is_maximizing:
+        best_score = -float('inf')
+        for row in range(3):
+            for col in range(3):
+                if b[row][col] == 0:
+                    b[row][col] = 2
+                    score = minimax(b, depth+1, False, stats)
+                    b[row][col] = 0
+                    best_score = max(score, best_score)
+        return best_score
+    else:
+        best_score = float('inf')
+        for row in range(3):
+            for col in range(3):
+                if b[row][col] == 0:
+                    b[row][col] = 1
+                    score = minimax(b, depth+1, True, stats)
+                    b[row][col] = 0
+                    best_score = min(score, best_score)
+        return best_score
+
+def ai_move(board, stats=None, agent=None):
+    # Plays the AI's move on board and returns it. With an MCTSAgent (see
+    # mcts.py) the agent picks the move, otherwise a full minimax search.
+    if agent is not None:
+        return mcts_ai_move(board, agent, stats)
+    if stats is not None:
+        stats.visit(0)
+        stats.expand(sum(value == 0 for row in board for value in row))
+    best_score = -float('inf')
+    move = None
+    for row in range(3):
+        for col in range(3):
+            if board[row][col] == 0:
+                board[row][col] = 2
+                score = minimax(board, 0, False, stats)
+                board[row][col] = 0
+                if score > best_score:
+                    best_score = score
+                    move = (row, col)
+    if move:
+        board[move[0]][move[1]] = 2
+    return move
+
+def mcts_ai_move(board, agent, stats=None):
+    move = agent.choose_move(board, 2, stats=stats)
+    if move:
+        board[move[0]][move[1]] = 2
+    return move
+
+def random_move(board):
+    empty = [(r,c) for r in range(3) for c in range(3) if board[r][c]==0]
+    if empty:
+        move = random.choice(empty)
+        board[move[0]][move[1]] = 1
+        return move